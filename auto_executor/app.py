@@ -1,13 +1,22 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, url_for
 import os
-import zipfile
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import json
-import io
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
-from utility.azure_api import AzureOpenAIClient
+from utility.client_manager import get_client_manager
 from utility.extraction import Extraction
+from utility.ingest import InvalidArchive, build_slim_archive, extract_members, ingest_upload, load_manifest
+from utility.job_queue import JobQueue
+from utility.prompt_registry import PromptRegistry
+from utility.runner_archetypes import match_archetype, render_archetype
+from utility.script_cache import ScriptCache, fill_script, structural_fingerprint
+from utility.speculation import SpeculationStats, predict_output_path, same_output_path
+from utility.static_analysis import analyze_archive
+from utility.submission_index import SubmissionIndex, prompt_key
 
 app = Flask(__name__)
 
@@ -19,6 +28,27 @@ logger.add("logs/error_{time}.log", rotation="100 MB", retention="30 days", leve
 UPLOAD_FOLDER = 'uploads'
 EXTRACTED_FOLDER = 'extracted_projects'
 ALLOWED_EXTENSIONS = {'zip'}
+JOB_QUEUE_DB = os.path.join('jobs', 'job_queue.db')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+SUBMISSION_INDEX_DB = os.path.join('jobs', 'submission_index.db')
+PROMPT_RELOAD_INTERVAL = float(os.environ.get('PROMPT_RELOAD_INTERVAL', '2'))
+# Deployments the analysis and script generation calls run on; each has its own limit in AZURE_DEPLOYMENT_LIMITS
+ANALYSIS_DEPLOYMENT = os.environ.get('ANALYSIS_DEPLOYMENT', os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'default'))
+SCRIPT_GEN_DEPLOYMENT = os.environ.get('SCRIPT_GEN_DEPLOYMENT', ANALYSIS_DEPLOYMENT)
+# Opt-in: run script generation alongside the analysis call instead of after it
+SPECULATIVE_SCRIPT_GEN = os.environ.get('SPECULATIVE_SCRIPT_GEN', '').lower() in ('1', 'true', 'yes')
+# Static pre-analysis at or above this confidence replaces the analysis LLM call; above 1 disables the skip
+STATIC_ANALYSIS_CONFIDENCE = float(os.environ.get('STATIC_ANALYSIS_CONFIDENCE', '0.85'))
+# Render the canonical runner for recognised project shapes instead of asking the LLM for a script
+RUNNER_ARCHETYPES = os.environ.get('RUNNER_ARCHETYPES', '1').lower() not in ('0', 'false', 'no')
+# Reuse LLM-generated runner scripts across submissions with the same structural fingerprint
+SCRIPT_CACHE = os.environ.get('SCRIPT_CACHE', '1').lower() not in ('0', 'false', 'no')
+SCRIPT_CACHE_DB = os.path.join('jobs', 'script_cache.db')
+# Upload a repackaged archive without vendored environments, build output and binaries
+SLIM_UPLOAD = os.environ.get('SLIM_UPLOAD', '1').lower() not in ('0', 'false', 'no')
+# `python app.py` runs the debug reloader: a parent process that only watches files and restarts
+# the child that serves requests. Workers and watcher threads belong in the serving process only.
+RELOADER_PARENT = __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['EXTRACTED_FOLDER'] = EXTRACTED_FOLDER
@@ -29,6 +59,15 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(EXTRACTED_FOLDER, exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
+submission_index = SubmissionIndex(SUBMISSION_INDEX_DB)
+script_cache = ScriptCache(SCRIPT_CACHE_DB)
+# Templates are read and validated once here; edits are picked up by the registry's mtime watcher
+prompt_registry = PromptRegistry(poll_interval=PROMPT_RELOAD_INTERVAL)
+if not RELOADER_PARENT:
+    prompt_registry.start()
+speculation_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='speculative-script')
+speculation_stats = SpeculationStats()
+
 logger.info("Auto Executor application started")
 
 
@@ -37,21 +76,6 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def extract_zip_file(file_object, extract_to):
-    """Extract a zip file from file object to the specified directory"""
-    try:
-        # Read file object into memory
-        file_bytes = io.BytesIO(file_object.read())
-
-        with zipfile.ZipFile(file_bytes, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
-        return True, "Extraction successful"
-    except zipfile.BadZipFile:
-        return False, "Invalid zip file"
-    except Exception as e:
-        return False, f"Extraction failed: {str(e)}"
-
-
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -108,7 +132,7 @@ def submit_project():
     problem_statement_id = request.form['problem_statement_id']
     user_story = request.form['user_story']
 
-    logger.info(f"Processing submission for problem_statement_id: {problem_statement_id}")
+    logger.info(f"Queueing submission for problem_statement_id: {problem_statement_id}")
 
     try:
         # Create a unique directory for this submission
@@ -121,31 +145,237 @@ def submit_project():
         # Save the zip file to disk
         filename = secure_filename(file.filename)
         zip_file_path = os.path.join(submission_dir, filename)
-        file.save(zip_file_path)
-        logger.info(f"Saved zip file: {filename} to {submission_dir}")
+        # One pass over the upload: save, hash, validate the central directory and list the members
+        manifest_path = os.path.join(submission_dir, 'manifest.json')
+        try:
+            ingested = ingest_upload(file, zip_file_path, manifest_path)
+        except InvalidArchive as e:
+            logger.warning(f"Rejected upload {filename}: {str(e)}")
+            return jsonify({'error': str(e), 'submission_id': submission_id}), 400
+        content_hash = ingested['sha256']
+        logger.info(f"Saved zip file: {filename} ({ingested['size']} bytes, sha256 {content_hash[:12]}) to {submission_dir}")
+
+        # An identical archive with identical prompts is answered from the index
+        submission_key = prompt_key(prompt_registry.version(problem_statement_id), problem_statement, user_story)
+        previous = submission_index.lookup(content_hash, submission_key)
+        if previous is not None:
+            logger.success(f"Duplicate of submission {previous['submission_id']}; reusing its analysis")
+            metadata = dict(previous,
+                            submission_id=submission_id,
+                            problem_statement_id=problem_statement_id,
+                            original_filename=filename,
+                            upload_timestamp=timestamp,
+                            zip_file_path=zip_file_path,
+                            manifest_path=manifest_path,
+                            content_sha256=content_hash,
+                            duplicate_of=previous['submission_id'])
+            metadata_path = os.path.join(submission_dir, 'metadata.json')
+            with open(metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
+            return jsonify({
+                'status': 'success',
+                'message': 'Identical project already analyzed; returning the stored result',
+                'submission_id': submission_id,
+                'duplicate_of': previous['submission_id'],
+                'azure_file_id': metadata['azure_file_id'],
+                'analysis': {
+                    'reasoning': metadata['llm_analysis']['reasoning'],
+                    'conclusion': metadata['llm_analysis']['conclusion']
+                },
+                'metadata': metadata
+            }), 200
+
+        # The slow part (Azure upload, LLM calls, extraction) runs on a background worker
+        job_id = job_queue.submit({
+            'submission_id': submission_id,
+            'submission_dir': submission_dir,
+            'problem_statement': problem_statement,
+            'problem_statement_id': problem_statement_id,
+            'user_story': user_story,
+            'filename': filename,
+            'zip_file_path': zip_file_path,
+            'manifest_path': manifest_path,
+            'timestamp': timestamp,
+            'content_hash': content_hash,
+            'prompt_key': submission_key
+        }, job_id=submission_id)
+
+        return jsonify({
+            'status': 'accepted',
+            'message': 'Project submitted and queued for analysis',
+            'job_id': job_id,
+            'submission_id': submission_id,
+            'status_url': url_for('get_job', job_id=job_id)
+        }), 202
+
+    except Exception as e:
+        logger.exception(f"Error queueing submission: {str(e)}")
+        return jsonify({
+            'error': f'Failed to queue submission: {str(e)}'
+        }), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report a queued submission's status, current stage, stage history and, once done, its metadata"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job_id: {job_id}'}), 404
+    return jsonify(job), 200
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Azure OpenAI call counters per deployment, script cache usage and, when enabled, speculative script generation outcomes"""
+    return jsonify({
+        'azure': get_client_manager().stats(),
+        'script_cache': script_cache.stats(),
+        'speculation': speculation_stats.snapshot() if SPECULATIVE_SCRIPT_GEN else None,
+        'timestamp': datetime.utcnow().isoformat()
+    }), 200
+
+
+def qualifies_for_script(conclusion):
+    """Script generation runs only when Python handles both the GenAI logic and the session output"""
+    return bool(conclusion and conclusion.get('python') == True and conclusion.get('output_handled_by_python') == True
+                and conclusion.get("path_output"))
+
+
+def generate_script(azure_client, script_gen_template, run_data_template, file_id, extract_dir):
+    """
+    Second LLM call: generate the runner script for a project extracted at extract_dir.
+    Returns a dict with the full response, its status, the extracted script and the call time.
+    """
+    # Format the instruction with actual values
+    script_gen_instruction = script_gen_template.render(
+        file_id=file_id,
+        multiple_run_data=run_data_template.render(),
+        output_file_path=extract_dir,
+        # extracted_project_path=extract_dir
+    )
+
+    # User prompt for script generation
+    script_gen_user_prompt = "Please generate the Python script to execute and test the project."
+
+    logger.info("Making second LLM call for script generation")
+    started = time.monotonic()
+    script_generation_response, script_gen_status = azure_client.get_completion(
+        deployment=SCRIPT_GEN_DEPLOYMENT,
+        instruction=script_gen_instruction,
+        user_prompt=script_gen_user_prompt,
+        file_id_list=[file_id],
+        eval_=False,
+        code_interpreter=True
+    )
+    logger.info(f"Second LLM call completed with status: {script_gen_status}")
+
+    # Extract the generated script from <script> tags
+    generated_script = Extraction.extract_text_from_tag(script_generation_response, 'script')
+    if generated_script:
+        logger.success("Successfully extracted generated script")
+    else:
+        logger.warning("No script found in <script> tags")
+    return {
+        'response': script_generation_response,
+        'status': script_gen_status,
+        'script': generated_script,
+        'source': 'llm',
+        'seconds': time.monotonic() - started
+    }
+
+
+def discard_speculation(speculative, speculative_dir, speculation):
+    """Drop a speculative script whose predicted output path the conclusion did not confirm"""
+    # A call already in flight cannot be recalled; it finishes in the background and counts as wasted
+    outcome = 'cancelled' if speculative.cancel() else 'wasted'
+    shutil.rmtree(speculative_dir, ignore_errors=True)
+    speculation['outcome'] = outcome
+    speculation_stats.record(outcome)
+    logger.info(f"Discarded speculative script for {speculation['predicted_path_output']}")
+
+
+def process_submission(job_id, payload, report_stage):
+    """
+    Run a queued submission: upload to Azure OpenAI, analyze it, generate the
+    runner script when the project qualifies, and save metadata.json.
+
+    Called by a JobQueue worker; report_stage(name) publishes progress to GET /jobs/<id>.
+    Returns the metadata dict, which becomes the job's result.
+    """
+    submission_id = payload['submission_id']
+    submission_dir = payload['submission_dir']
+    problem_statement = payload['problem_statement']
+    problem_statement_id = payload['problem_statement_id']
+    user_story = payload['user_story']
+    filename = payload['filename']
+    zip_file_path = payload['zip_file_path']
+    timestamp = payload['timestamp']
+    manifest = load_manifest(payload['manifest_path'])
+    # Resolve templates up front so all stages of this job use the same versions. Run data is
+    # only required once a script is generated, as before, so a missing test_data/ fails only that.
+    analysis_template = prompt_registry.get('analysis', problem_statement_id)
+    script_gen_template = prompt_registry.get('script_gen', problem_statement_id)
+    run_data_template = prompt_registry.find('run_data', problem_statement_id)
+
+    logger.info(f"Processing submission {submission_id} for problem_statement_id: {problem_statement_id}")
+
+    # Static pre-analysis: a confident local answer replaces the first LLM call
+    report_stage('static_analysis')
+    static_analysis = analyze_archive(zip_file_path, manifest)
+    skip_analysis_call = static_analysis['confidence'] >= STATIC_ANALYSIS_CONFIDENCE
+    logger.info(f"Static analysis conclusion: {static_analysis['conclusion']} (confidence {static_analysis['confidence']}, "
+                f"LLM analysis {'skipped' if skip_analysis_call else 'required'})")
+    runner_match = match_archetype(zip_file_path, manifest, static_analysis) if RUNNER_ARCHETYPES else None
+
+    # A structurally identical earlier submission may already have a validated script
+    script_fingerprint = structure = cached_script = script_version = None
+    if SCRIPT_CACHE and runner_match is None and run_data_template is not None \
+            and static_analysis['conclusion']['path_output']:
+        script_version = f'{script_gen_template.version}:{run_data_template.version}'
+        script_fingerprint, structure = structural_fingerprint(manifest, static_analysis)
+        cached_script = script_cache.lookup(script_fingerprint, script_version)
+        if cached_script is not None:
+            logger.info(f"Structural fingerprint {script_fingerprint[:12]} matches submission {cached_script[1]}")
+
+    azure_client = get_client_manager()
+    upload_file = None
+    slim_archive = None
+    # With the analysis call skipped, only LLM script generation needs the upload
+    if not skip_analysis_call or (qualifies_for_script(static_analysis['conclusion'])
+                                  and runner_match is None and cached_script is None):
+        upload_path = zip_file_path
+        if SLIM_UPLOAD:
+            report_stage('repackaging')
+            slim_archive = build_slim_archive(zip_file_path, manifest, os.path.join(submission_dir, f'slim_{filename}'))
+            upload_path = slim_archive['path']
+            logger.info(f"Slim archive: {slim_archive['member_count']} files, {slim_archive['bytes']} of "
+                        f"{slim_archive['original_bytes']} bytes (ratio {slim_archive['ratio']}), left out {slim_archive['skipped']}")
 
         # Upload file to Azure OpenAI
+        report_stage('uploading')
         logger.info("Uploading file to Azure OpenAI")
-        azure_client = AzureOpenAIClient()
-        upload_file = azure_client.upload_file(zip_file_path, purpose='assistants')
+        upload_file = azure_client.upload_file(upload_path, purpose='assistants')
 
         if not upload_file['success']:
             logger.error(f"Failed to upload file to Azure OpenAI: {upload_file['error']}")
-            return jsonify({
-                'error': f'Failed to upload file to Azure OpenAI: {upload_file["error"]}',
-                'submission_id': submission_id
-            }), 500
+            raise RuntimeError(f'Failed to upload file to Azure OpenAI: {upload_file["error"]}')
 
         logger.success(f"File uploaded to Azure OpenAI with file_id: {upload_file['file_id']}")
 
-        # Read the askbit prompt template
-        logger.info("Reading instruction prompt template")
-        prompt_file_path = os.path.join('prompts', 'instructions', 'analysis' ,'askbit.txt')
-        with open(prompt_file_path, 'r', encoding='utf-8') as f:
-            instruction_template = f.read()
+    speculative = None
+    speculation = None
+    if skip_analysis_call:
+        reasoning = static_analysis['reasoning']
+        conclusion = static_analysis['conclusion']
+        llm_response = None
+        llm_status = 'skipped'
+        logger.info(f"Using the static conclusion: {conclusion}")
+    else:
+        report_stage('analyzing')
+        logger.info(f"Using analysis prompt template '{analysis_template.name}' (version {analysis_template.version})")
 
         # Format the instruction with actual values
-        instruction = instruction_template.format(
+        instruction = analysis_template.render(
             file_id=upload_file['file_id'],
             problem_statement=problem_statement,
             user_story=user_story
@@ -154,15 +384,42 @@ def submit_project():
         # User prompt to execute the task
         user_prompt = "Please analyze the submitted project according to the instructions provided."
 
+        # Speculative mode: start script generation for the predicted output path while the analysis
+        # call runs; the conclusion decides whether the result is kept. The static analysis path comes
+        # first, since output directories are usually created at run time and are not in the archive.
+        # Not needed when an archetype runner or a cached script can be used instead.
+        if SPECULATIVE_SCRIPT_GEN and runner_match is None and cached_script is None and run_data_template is not None:
+            predicted_output = static_analysis['conclusion']['path_output']
+            prediction_source = 'static_analysis'
+            if not predicted_output:
+                predicted_output = predict_output_path(manifest)
+                prediction_source = 'manifest' if predicted_output else None
+            speculation = {'predicted_path_output': predicted_output, 'prediction_source': prediction_source,
+                           'outcome': 'not_predicted'}
+            if predicted_output is None:
+                logger.info("No output path predicted; script generation will wait for the analysis")
+                speculation_stats.record('not_predicted')
+            else:
+                speculative_dir = os.path.join(app.config['EXTRACTED_FOLDER'], submission_id, predicted_output)
+                extracted_files = extract_members(zip_file_path, manifest, speculative_dir)
+                logger.info(f"Speculatively generating the script for output path {predicted_output} predicted by "
+                            f"{prediction_source} ({extracted_files} files extracted to {speculative_dir})")
+                speculative = speculation_pool.submit(
+                    generate_script, azure_client, script_gen_template, run_data_template, upload_file['file_id'], speculative_dir
+                )
+
         # Make LLM call using get_completion
         logger.info("Making first LLM call for project analysis")
+        analysis_started = time.monotonic()
         llm_response, llm_status = azure_client.get_completion(
+            deployment=ANALYSIS_DEPLOYMENT,
             instruction=instruction,
             user_prompt=user_prompt,
             file_id_list=[upload_file['file_id']],
             eval_=False,
             code_interpreter=True
         )
+        analysis_seconds = time.monotonic() - analysis_started
         logger.info(f"First LLM call completed with status: {llm_status}")
 
         # Extract reasoning and conclusion from response
@@ -171,120 +428,156 @@ def submit_project():
         conclusion = Extraction.extract_json_from_tag(llm_response, 'conclusion')
         logger.info(f"Extracted conclusion: {conclusion}")
 
-        # Initialize script generation variables
-        script_generation_response = None
-        generated_script = None
-        extract_dir = None
-
-        # Check if both python conditions are True
-        if conclusion and conclusion.get('python') == True and conclusion.get('output_handled_by_python') == True and conclusion.get("path_output"):
-            logger.info("Python conditions met, proceeding with script generation")
+    # Initialize script generation variables
+    script_generation = None
+    extract_dir = None
+
+    # Check if both python conditions are True
+    if qualifies_for_script(conclusion):
+        logger.info("Python conditions met, proceeding with script generation")
+        output_path = conclusion.get("path_output")
+        logger.info(f"Output path from conclusion: {output_path}")
+
+        # Without run data the rendered runner keeps its own BATCH_INPUTS
+        run_data = run_data_template.render() if run_data_template else None
+        runner_script = render_archetype(runner_match, conclusion, run_data) if runner_match else None
+        if runner_script is not None:
+            report_stage('rendering_runner')
+            logger.success(f"Rendered the runner from archetype '{runner_match['archetype']}'; skipping the script generation call")
+            script_generation = {
+                'response': None,
+                'status': 'rendered',
+                'script': runner_script,
+                'source': 'archetype',
+                'archetype': runner_match['archetype']
+            }
+        elif cached_script is not None and same_output_path(structure['path_output'], output_path):
+            # Filled in with the directory the extraction step below creates
+            cached_dir = os.path.join(app.config['EXTRACTED_FOLDER'], submission_id, output_path)
+            report_stage('reusing_script')
+            logger.success(f"Reusing the script of structurally identical submission {cached_script[1]}; "
+                           f"skipping the script generation call")
+            script_cache.record_hit(script_fingerprint, script_version)
+            script_generation = {
+                'response': None,
+                'status': 'cached',
+                'script': fill_script(cached_script[0], cached_dir),
+                'source': 'cache',
+                'cached_from': cached_script[1]
+            }
+        elif speculative is not None and same_output_path(speculation['predicted_path_output'], output_path):
+            report_stage('generating_script')
+            logger.info("Conclusion matches the predicted output path; using the speculative script")
+            try:
+                script_generation = speculative.result()
+            except Exception as e:
+                logger.exception(f"Speculative script generation failed, generating it again: {str(e)}")
+                discard_speculation(speculative, speculative_dir, speculation)
+            else:
+                extract_dir = speculative_dir
+                speculation['outcome'] = 'kept'
+                speculation_stats.record('kept', min(analysis_seconds, script_generation['seconds']))
+        elif speculative is not None:
+            discard_speculation(speculative, speculative_dir, speculation)
 
-            # Read the script generation prompt template
-            output_path = conclusion.get("path_output")
-            logger.info(f"Output path from conclusion: {output_path}")
+        if extract_dir is None:
+            report_stage('extracting')
 
             # Extract the zip file to get the unzipped folder path
-            extract_dir = os.path.join(app.config['EXTRACTED_FOLDER'], submission_id,output_path)
-            print(extract_dir)
-            os.makedirs(extract_dir, exist_ok=True)
+            extract_dir = os.path.join(app.config['EXTRACTED_FOLDER'], submission_id, output_path)
             logger.info(f"Extracting zip file to: {extract_dir}")
 
-            with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+            # Members come from the ingest manifest; vendored trees are not extracted
+            extracted_files = extract_members(zip_file_path, manifest, extract_dir)
 
-            logger.success(f"Zip file extracted successfully to: {extract_dir}")
-
-            script_gen_prompt_path = os.path.join('prompts', 'instructions' ,'script_gen', 'askbit.txt')
-            script_gen_multiple_run_op = os.path.join('test_data', 'askbit.txt')
-            with open(script_gen_prompt_path, 'r', encoding='utf-8') as f:
-                script_gen_template = f.read()
-            with open(script_gen_multiple_run_op, 'r', encoding='utf-8') as f:
-                multiple_run_data = f.read()
-
-            # Format the instruction with actual values
-            script_gen_instruction = script_gen_template.format(
-                file_id=upload_file['file_id'],
-                multiple_run_data=multiple_run_data,
-                output_file_path=extract_dir,
-                # extracted_project_path=extract_dir
-            )
+            logger.success(f"Zip file extracted successfully to: {extract_dir} ({extracted_files} files)")
 
-            # User prompt for script generation
-            script_gen_user_prompt = "Please generate the Python script to execute and test the project."
-
-            # Make second LLM call for script generation
-            logger.info("Making second LLM call for script generation")
-            script_generation_response, script_gen_status = azure_client.get_completion(
-                instruction=script_gen_instruction,
-                user_prompt=script_gen_user_prompt,
-                file_id_list=[upload_file['file_id']],
-                eval_=False,
-                code_interpreter=True
+        if script_generation is None:
+            report_stage('generating_script')
+            # Raises TemplateError, failing only this job, when there is no run data to test with
+            run_data_template = run_data_template or prompt_registry.get('run_data', problem_statement_id)
+            script_generation = generate_script(
+                azure_client, script_gen_template, run_data_template, upload_file['file_id'], extract_dir
             )
-            logger.info(f"Second LLM call completed with status: {script_gen_status}")
 
-            # Extract the generated script from <script> tags
-            generated_script = Extraction.extract_text_from_tag(script_generation_response, 'script')
-            if generated_script:
-                logger.success("Successfully extracted generated script")
-            else:
-                logger.warning("No script found in <script> tags")
-        else:
-            logger.info("Python conditions not met, skipping script generation")
-
-        # Save metadata
-        metadata = {
-            'submission_id': submission_id,
-            'problem_statement_id': problem_statement_id,
-            'problem_statement': problem_statement,
-            'user_story': user_story,
-            'original_filename': filename,
-            'upload_timestamp': timestamp,
-            'zip_file_path': zip_file_path,
-            'azure_file_id': upload_file['file_id'],
-            'azure_file_status': upload_file['status'],
-            'file_size_bytes': upload_file['bytes'],
-            'llm_analysis': {
-                'reasoning': reasoning,
-                'conclusion': conclusion,
-                'full_response': llm_response,
-                'status': llm_status
-            },
-            'script_generation': {
-                'generated': generated_script is not None,
-                'script': generated_script,
-                'extracted_project_path': extract_dir,
-                'full_response': script_generation_response
-            } if generated_script else None
-        }
-
-        # Save metadata to JSON file
-        logger.info("Saving metadata to JSON file")
-        metadata_path = os.path.join(submission_dir, 'metadata.json')
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
-        logger.success(f"Metadata saved successfully to {metadata_path}")
-
-        logger.success(f"Project submission {submission_id} processed successfully")
-
-        return jsonify({
-            'status': 'success',
-            'message': 'Project submitted, analyzed, and uploaded to Azure OpenAI successfully',
-            'submission_id': submission_id,
-            'azure_file_id': upload_file['file_id'],
-            'analysis': {
-                'reasoning': reasoning,
-                'conclusion': conclusion
-            },
-            'metadata': metadata
-        }), 200
-
-    except Exception as e:
-        logger.exception(f"Error processing submission: {str(e)}")
-        return jsonify({
-            'error': f'Failed to process submission: {str(e)}'
-        }), 500
+        if script_generation['source'] == 'llm' and script_generation['script'] and script_fingerprint is not None \
+                and same_output_path(structure['path_output'], output_path):
+            script_cache.store(script_fingerprint, script_version, structure, script_generation['script'],
+                               extract_dir, submission_id)
+    else:
+        if speculative is not None:
+            discard_speculation(speculative, speculative_dir, speculation)
+        logger.info("Python conditions not met, skipping script generation")
+
+    generated_script = script_generation['script'] if script_generation else None
+    script_generation_response = script_generation['response'] if script_generation else None
+
+    # Save metadata
+    metadata = {
+        'submission_id': submission_id,
+        'problem_statement_id': problem_statement_id,
+        'problem_statement': problem_statement,
+        'user_story': user_story,
+        'original_filename': filename,
+        'upload_timestamp': timestamp,
+        'zip_file_path': zip_file_path,
+        'manifest_path': payload['manifest_path'],
+        'content_sha256': payload['content_hash'],
+        'archive': {
+            'member_count': manifest['member_count'],
+            'uncompressed_bytes': manifest['uncompressed_bytes'],
+            'vendored_member_count': manifest['vendored_member_count'],
+            'vendored_bytes': manifest['vendored_bytes']
+        },
+        'prompt_templates': {
+            template.kind: {'name': template.name, 'version': template.version}
+            for template in (analysis_template, script_gen_template, run_data_template) if template is not None
+        },
+        'azure_file_id': upload_file['file_id'] if upload_file else None,
+        'azure_file_status': upload_file['status'] if upload_file else None,
+        'file_size_bytes': upload_file['bytes'] if upload_file else None,
+        'slim_archive': slim_archive,
+        'static_analysis': dict(static_analysis, used=skip_analysis_call),
+        'llm_analysis': {
+            'reasoning': reasoning,
+            'conclusion': conclusion,
+            'full_response': llm_response,
+            'status': llm_status
+        },
+        'script_generation': {
+            'generated': generated_script is not None,
+            'script': generated_script,
+            'extracted_project_path': extract_dir,
+            'source': script_generation['source'],
+            'archetype': script_generation.get('archetype'),
+            'cached_from': script_generation.get('cached_from'),
+            'structural_fingerprint': script_fingerprint,
+            'full_response': script_generation_response
+        } if generated_script else None,
+        'speculation': speculation
+    }
+
+    # Save metadata to JSON file
+    report_stage('saving_metadata')
+    logger.info("Saving metadata to JSON file")
+    metadata_path = os.path.join(submission_dir, 'metadata.json')
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    logger.success(f"Metadata saved successfully to {metadata_path}")
+
+    # Only complete results are replayed to identical resubmissions; a malformed response is retried next time
+    if not isinstance(conclusion, dict):
+        logger.warning(f"Not indexing {submission_id}: the analysis conclusion could not be parsed")
+    elif qualifies_for_script(conclusion) and generated_script is None:
+        logger.warning(f"Not indexing {submission_id}: the project qualifies but no script was generated")
+    else:
+        submission_index.store(payload['content_hash'], payload['prompt_key'], metadata)
+
+    logger.success(f"Project submission {submission_id} processed successfully")
+    return metadata
+
+
+job_queue = None if RELOADER_PARENT else JobQueue(JOB_QUEUE_DB, process_submission, worker_count=JOB_WORKERS).start()
 
 
 if __name__ == '__main__':
@@ -7,8 +7,24 @@ import time
 import json
 import glob
 import socket
-from urllib import request as urllib_request
+import threading
+import io
+import http.client
+import collections
+import re
+import signal
+import hashlib
+import csv
+import itertools
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 from urllib import error as urllib_error
+from urllib import parse as urllib_parse
 
 # -------------------------
 # Configuration (auto/fallback)
@@ -38,35 +54,155 @@ BATCH_INPUTS = [
     "20. How long does the referral ownership last?"
 ]
 
+# Session name for suite items that do not name one (and for BATCH_INPUTS).
+DEFAULT_SESSION_NAME = "default"
+
 DEFAULT_ZIP_NAME_HINTS = [
     "assistant-BgMWbAffC61FDkxjR9jiaQ-ConversationalChatbot.zip",
     "ConversationalChatbot.zip",
     "genai_project.zip",
 ]
+# Zip to run when none is given on the command line (set by rendered runners).
+PROJECT_ZIP = None
 
 PROJECT_ROOT_DIRNAME_HINT = "ConversationalChatbot"
 BACKEND_DIRNAME = "backend-python"
 BACKEND_APP_FILENAME = "app.py"
 REQUIREMENTS_FILENAME = "requirements.txt"
 VENV_DIRNAME = ".venv_team_alpha"
+MANIFEST_FILENAME = "project_manifest.json"
+
+# Directory names that never hold submission sources. Bundled virtualenvs are
+# also detected by their pyvenv.cfg marker, whatever they are called.
+DEFAULT_PRUNE_DIRS = {
+    ".git", ".hg", ".svn", ".idea", ".vscode",
+    "__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    "venv", ".venv", "site-packages", "dist-packages",
+    "node_modules", "bower_components", ".next", ".gradle",
+}
+# Usually build artefacts, but also plausible names for a project's own packages:
+# pruned only when no entry point lives anywhere below them.
+BUILD_OUTPUT_DIRS = {"build", "dist", "target"}
+ENTRY_POINT_FILENAMES = {"app.py", "main.py", "server.py", "run.py", "wsgi.py", "manage.py", "cli.py"}
+DEPENDENCY_FILENAMES = {"requirements.txt", "pyproject.toml", "setup.py", "Pipfile", "package.json", "pom.xml", "build.gradle"}
+OUTPUT_DIR_NAMES = {"output", "outputs"}
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".java": "java",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
+# compileall -x pattern that keeps bytecode precompilation out of vendored trees and venvs
+PRECOMPILE_EXCLUDE = r"[/\\](?:%s|\.venv[^/\\]*)[/\\]" % "|".join(re.escape(d) for d in sorted(DEFAULT_PRUNE_DIRS))
 HOST = "127.0.0.1"
-PORT = 5000
-BASE_URL = f"http://{HOST}:{PORT}"
-HEALTH_URL = f"{BASE_URL}/health"
-CHAT_URL = f"{BASE_URL}/chat"
-RESET_URL = f"{BASE_URL}/reset"
+HEALTH_ROUTE = "/health"
+CHAT_ROUTE = "/chat"
+RESET_ROUTE = "/reset"
+# Backends often name sessions after the current second, so /reset only yields a new
+# id once the previous session is that old. A reset that still repeats the id is
+# retried (each retry re-saves the empty session under the old id) until the timeout.
+SESSION_ID_MIN_AGE = 1.0
+SESSION_RESET_TIMEOUT = 5.0
+SESSION_RESET_RETRY_INTERVAL = 0.25
+# Chat API contract: request/response fields, the text /health must contain,
+# and where the backend writes each session, relative to its directory.
+CHAT_REQUEST_FIELD = "user_message"
+CHAT_RESPONSE_FIELD = "assistant_response"
+HEALTH_SERVICE_MARKER = "Python Flask Backend"
+OUTPUT_DIRNAME = "output"
+SESSION_FILE_TEMPLATE = "session_{session_id}.json"
+
+# Each launched backend gets its own free port, exported under these names and
+# forced onto Flask's app.run() by LAUNCH_SHIM for apps that hard-code a port.
+PORT_ENV_VARS = ("PORT", "FLASK_RUN_PORT", "RUNNER_PORT")
+LAUNCH_ATTEMPTS = 3
+LAUNCH_SHIM = """
+import os, runpy, sys
+host = os.environ.get("RUNNER_HOST", "127.0.0.1")
+port = int(os.environ["RUNNER_PORT"])
+try:
+    import flask
+except ImportError:
+    flask = None
+if flask is not None:
+    _run = flask.Flask.run
+    def run(self, *args, **kwargs):
+        kwargs.pop("host", None)
+        kwargs.pop("port", None)
+        kwargs["use_reloader"] = False
+        return _run(self, host, port, *args[2:], **kwargs)
+    flask.Flask.run = run
+app_path = os.path.abspath(sys.argv[1])
+sys.argv = [app_path] + sys.argv[2:]
+sys.path.insert(0, os.path.dirname(app_path))
+runpy.run_path(app_path, run_name="__main__")
+"""
+
+# Cohort scheduling: per-stage concurrency (unzip/scan and venv/pip are
+# I/O-bound, backend runs are CPU-bound) and the default per-job time budget.
+DEFAULT_STAGE_LIMITS = {
+    "prepare": 4,
+    "install": 8,
+    "run": max(1, os.cpu_count() or 1),
+}
+DEFAULT_JOB_TIMEOUT = 900
+# Warm pool (--warm-pool): idle backends kept per environment hash, recycled after
+# this many jobs or once their RSS grows this much past the launch baseline.
+DEFAULT_POOL_MAX_JOBS = 20
+DEFAULT_POOL_MAX_RSS_GROWTH = 256 * 1024 * 1024
+# Load stage (--load-concurrency): default window, per-request timeout, and how many
+# suite prompts the load clients cycle through.
+DEFAULT_LOAD_DURATION = 30
+LOAD_REQUEST_TIMEOUT = 30.0
+LOAD_MAX_PROMPTS = 1000
+# Resource accounting: how often the backend's process tree is sampled from /proc.
+# Ceilings (--max-cpu-seconds etc.) are off unless given.
+RESOURCE_SAMPLE_INTERVAL = 1.0
+# Startup profiling (--profile-startup): how many of the heaviest imports to keep.
+IMPORT_PROFILE_TOP = 15
+RESULTS_INDEX_FILENAME = "results_index.json"
+TRACE_FILENAME = "automation_trace.jsonl"
+TRACE_SUMMARY_FILENAME = "trace_summary.json"
+RESULTS_FILENAME = "automation_results.json"  # small summary header, written at the end
+RESULTS_STREAM_FILENAME = "automation_results.jsonl"  # one record per turn/session, written as they complete
+CHECKPOINT_FILENAME = "automation_checkpoint.json"  # environment handle and progress pointer for --resume
+
+# Readiness detection: log lines that mean the server has bound its socket,
+# the fast polling tick, and the exponential backoff used for HTTP probes.
+BIND_MESSAGE_PATTERNS = ("Running on http", "Uvicorn running on", "Listening on", "Serving on")
+READY_POLL_INTERVAL = 0.05
+
+# Backend output kept in memory for diagnostics; everything else is spooled to server.log.
+LOG_RING_LINES = 200
+PROBE_BACKOFF_INITIAL = 0.05
+PROBE_BACKOFF_MAX = 1.0
+
+# -------------------------
+# Project overrides
+# -------------------------
+# Runners rendered for a specific submission replace the lines between these
+# markers with assignments to the constants above. Keep both markers intact.
+# BEGIN PROJECT OVERRIDES
+# END PROJECT OVERRIDES
 
 # -------------------------
 # Utilities
 # -------------------------
 
+_log_context = threading.local()
+
 def log(msg):
+    # Cohort workers tag their lines with the job id
+    tag = getattr(_log_context, "tag", None)
+    if tag:
+        msg = f"[{tag}] {msg}"
     print(msg, flush=True)
 
-def find_first_zip(path="."):
+def find_first_zip(path=".", cand=None):
     # First try explicit CLI arg
-    if len(sys.argv) > 1:
-        cand = sys.argv[1]
+    if cand:
         if os.path.isfile(cand) and cand.lower().endswith(".zip"):
             return os.path.abspath(cand)
         else:
@@ -82,10 +218,12 @@ def find_first_zip(path="."):
         return os.path.abspath(zips[0])
     return None
 
+def default_extract_dir(zip_path):
+    return os.path.abspath(os.path.splitext(os.path.basename(zip_path))[0])
+
 def unzip_project(zip_path, extract_to=None):
     if extract_to is None:
-        base = os.path.splitext(os.path.basename(zip_path))[0]
-        extract_to = os.path.abspath(base)
+        extract_to = default_extract_dir(zip_path)
     # If exists, remove to ensure clean state
     if os.path.exists(extract_to):
         log(f"[INFO] Removing existing directory: {extract_to}")
@@ -96,13 +234,174 @@ def unzip_project(zip_path, extract_to=None):
         z.extractall(extract_to)
     return extract_to
 
-def locate_backend_dir(extracted_root):
+# -------------------------
+# Input suites
+# -------------------------
+
+SUITE_PROMPT_FIELDS = ("prompt", "user_message", "input", "question")
+SUITE_RESERVED_FIELDS = {"session", "id", "expected", "tags"} | set(SUITE_PROMPT_FIELDS)
+
+def suite_item(raw, line_no, default_session=DEFAULT_SESSION_NAME):
+    """Normalise one suite row into {session, id, prompt, expected, tags, metadata}."""
+    prompt = next((raw[f] for f in SUITE_PROMPT_FIELDS if raw.get(f)), None)
+    if prompt is None:
+        raise ValueError(f"Suite item on line {line_no} has no prompt (expected one of {SUITE_PROMPT_FIELDS})")
+    session = str(raw.get("session") or default_session)
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(";") if t.strip()]
+    return {
+        "session": session,
+        "id": str(raw.get("id") or f"{session}-{line_no}"),
+        "prompt": prompt,
+        "expected": raw.get("expected") or None,
+        "tags": tags,
+        "metadata": {k: v for k, v in raw.items() if k not in SUITE_RESERVED_FIELDS and v not in (None, "")},
+    }
+
+def iter_suite(path):
+    """Lazily yield suite items from a .jsonl or .csv file, one row at a time.
+
+    JSONL rows are objects; CSV files need a header row. Both use the columns
+    prompt (or user_message/input/question), and optionally session, id,
+    expected and tags (';'-separated in CSV); any other column becomes metadata.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield suite_item(row, line_no)
+        elif ext in (".jsonl", ".ndjson"):
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield suite_item(json.loads(line), line_no)
+        else:
+            raise ValueError(f"Unsupported suite format: {path} (use .jsonl or .csv)")
+
+def iter_builtin_suite():
+    for idx, prompt in enumerate(BATCH_INPUTS, start=1):
+        yield {"session": DEFAULT_SESSION_NAME, "id": str(idx), "prompt": prompt, "expected": None, "tags": [], "metadata": {}}
+
+def iter_sessions(items):
+    """Group consecutive items by session name; yields (name, item iterator).
+
+    Rows of a session must be contiguous; a name that reappears later starts a new session.
+    """
+    for name, group in itertools.groupby(items, key=lambda item: item["session"]):
+        yield name, group
+
+# -------------------------
+# Project scanning
+# -------------------------
+
+_MANIFEST_CACHE = {}
+
+def is_pruned_dir(entry, prune_dirs):
+    if entry.name in prune_dirs or entry.name.startswith(".venv"):
+        return True
+    if os.path.isfile(os.path.join(entry.path, "pyvenv.cfg")):
+        return True
+    return entry.name in BUILD_OUTPUT_DIRS and not contains_entry_point(entry.path, prune_dirs)
+
+def contains_entry_point(path, prune_dirs):
+    """Whether a known entry point file lies anywhere below path, outside pruned trees; stops at the first."""
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_pruned_dir(entry, prune_dirs):
+                        stack.append(entry.path)
+                elif entry.name in ENTRY_POINT_FILENAMES:
+                    return True
+            except OSError:
+                continue
+    return False
+
+def scan_project(root, prune_dirs=None):
+    """Walk the project once with os.scandir, skipping vendored trees, and build a manifest.
+
+    All paths in the manifest are relative to ``root``.
+    """
+    if prune_dirs is None:
+        prune_dirs = DEFAULT_PRUNE_DIRS
+    root = os.path.abspath(root)
+    manifest = {
+        "root": root,
+        "entry_points": [],
+        "dependency_files": [],
+        "output_dirs": [],
+        "backend_candidates": [],
+        "languages": {},
+        "pruned_dirs": [],
+    }
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        rel_dir = os.path.relpath(current, root)
+        file_names = set()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            log(f"[WARN] Could not scan {current}: {e}")
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            rel_path = os.path.normpath(os.path.join(rel_dir, entry.name))
+            if is_dir:
+                if is_pruned_dir(entry, prune_dirs):
+                    manifest["pruned_dirs"].append(rel_path)
+                    continue
+                if entry.name in OUTPUT_DIR_NAMES:
+                    manifest["output_dirs"].append(rel_path)
+                stack.append(entry.path)
+                continue
+            file_names.add(entry.name)
+            if entry.name in ENTRY_POINT_FILENAMES:
+                manifest["entry_points"].append(rel_path)
+            if entry.name in DEPENDENCY_FILENAMES:
+                manifest["dependency_files"].append(rel_path)
+            language = LANGUAGE_EXTENSIONS.get(os.path.splitext(entry.name)[1].lower())
+            if language:
+                manifest["languages"][language] = manifest["languages"].get(language, 0) + 1
+        if BACKEND_APP_FILENAME in file_names and REQUIREMENTS_FILENAME in file_names:
+            manifest["backend_candidates"].append(os.path.normpath(rel_dir))
+    for key in ("entry_points", "dependency_files", "output_dirs", "backend_candidates", "pruned_dirs"):
+        manifest[key].sort()
+    return manifest
+
+def get_project_manifest(project_root, refresh=False):
+    """Return the manifest for project_root, scanning only on first use after an extraction."""
+    key = os.path.abspath(project_root)
+    if refresh or key not in _MANIFEST_CACHE:
+        manifest = scan_project(key)
+        _MANIFEST_CACHE[key] = manifest
+        manifest_path = os.path.join(key, MANIFEST_FILENAME)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        log(f"[INFO] Project manifest: {len(manifest['entry_points'])} entry point(s), "
+            f"languages={manifest['languages']}, pruned {len(manifest['pruned_dirs'])} dir(s)")
+    return _MANIFEST_CACHE[key]
+
+def locate_backend_dir(extracted_root, manifest=None):
     """Find backend-python directory that contains app.py and requirements.txt."""
     # Common structure: <root>/ConversationalChatbot/backend-python
-    candidates = []
-    for root, dirs, files in os.walk(extracted_root):
-        if BACKEND_APP_FILENAME in files and REQUIREMENTS_FILENAME in files and os.path.basename(root) == BACKEND_DIRNAME:
-            candidates.append(root)
+    if manifest is None:
+        manifest = get_project_manifest(extracted_root)
+    candidates = [
+        os.path.join(manifest["root"], rel)
+        for rel in manifest["backend_candidates"]
+        if os.path.basename(rel) == BACKEND_DIRNAME
+    ]
     if not candidates:
         raise FileNotFoundError("Could not locate backend-python directory with app.py and requirements.txt")
     # Prefer a path that has PROJECT_ROOT_DIRNAME_HINT in its ancestors
@@ -114,6 +413,10 @@ def locate_backend_dir(extracted_root):
     log(f"[INFO] Located backend directory: {chosen}")
     return chosen
 
+# -------------------------
+# Environment helpers
+# -------------------------
+
 def venv_python_path(venv_dir):
     if os.name == "nt":
         return os.path.join(venv_dir, "Scripts", "python.exe")
@@ -126,237 +429,1724 @@ def venv_pip_path(venv_dir):
     else:
         return os.path.join(venv_dir, "bin", "pip")
 
-def create_venv(venv_dir):
+def create_venv(venv_dir, deadline=None):
     py = sys.executable
     log(f"[INFO] Creating virtual environment at: {venv_dir}")
-    subprocess.check_call([py, "-m", "venv", venv_dir])
+    run_checked([py, "-m", "venv", venv_dir], deadline)
 
-def install_requirements(pip_path, requirements_path):
+def install_requirements(pip_path, requirements_path, deadline=None):
     log(f"[INFO] Installing requirements from: {requirements_path}")
-    subprocess.check_call([pip_path, "install", "-r", requirements_path])
+    run_checked([pip_path, "install", "-r", requirements_path], deadline)
+
+def venv_site_packages(venv_dir):
+    if os.name == "nt":
+        return glob.glob(os.path.join(venv_dir, "Lib", "site-packages"))
+    return sorted(glob.glob(os.path.join(venv_dir, "lib", "python*", "site-packages")))
+
+def precompile_environment(venv_python, venv_dir, source_root, deadline=None):
+    """Byte-compile a freshly installed venv's site-packages and the project's sources on all cores.
+
+    Runs once per install, before the first launch; a checkpointed or warm
+    environment that is reused skips install and this with it.
+    """
+    log(f"[INFO] Precompiling site-packages in: {venv_dir}")
+    try:
+        # -qq: third-party trees often carry deliberately invalid files (test data, py2 templates)
+        run_checked([venv_python, "-m", "compileall", "-qq", "-j", "0", *venv_site_packages(venv_dir)], deadline)
+    except subprocess.CalledProcessError:
+        log("[WARN] Some site-packages files did not compile; they will compile on import if used")
+    log(f"[INFO] Precompiling project sources in: {source_root}")
+    try:
+        run_checked([venv_python, "-m", "compileall", "-q", "-j", "0", "-x", PRECOMPILE_EXCLUDE, source_root], deadline)
+    except subprocess.CalledProcessError:
+        log("[WARN] Some project sources did not compile; the backend may fail to import them")
 
-def port_is_open(host, port):
+def port_is_open(host, port, timeout=0.5):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(0.5)
+        s.settimeout(timeout)
         try:
             s.connect((host, port))
             return True
         except Exception:
             return False
 
+# -------------------------
+# HTTP client
+# -------------------------
+
+# Errors that mean a kept-alive connection was closed under us.
+CONNECTION_RESET_ERRORS = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError, http.client.RemoteDisconnected)
+# What a failed request to the backend raises: HTTP status/protocol, URL and socket errors, or a non-JSON body
+REQUEST_ERRORS = (urllib_error.URLError, http.client.HTTPException, OSError, json.JSONDecodeError)
+
+class KeepAliveClient:
+    """Pooled HTTP/1.1 client holding one persistent connection per host:port per thread.
+
+    Requests on a reused connection that turns out to be stale are retried on a
+    fresh one; GETs are also retried when a fresh connection is reset.
+    """
+
+    def __init__(self, max_retries=1):
+        self.max_retries = max_retries
+        self._local = threading.local()
+
+    def traffic(self):
+        """Body bytes (sent, received) by the calling thread so far."""
+        return getattr(self._local, "bytes_sent", 0), getattr(self._local, "bytes_received", 0)
+
+    def _count(self, sent, received):
+        self._local.bytes_sent = getattr(self._local, "bytes_sent", 0) + sent
+        self._local.bytes_received = getattr(self._local, "bytes_received", 0) + received
+
+    def _pool(self):
+        pool = getattr(self._local, "connections", None)
+        if pool is None:
+            pool = self._local.connections = {}
+        return pool
+
+    def _drop(self, key):
+        conn = self._pool().pop(key, None)
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, url, body=None, headers=None, timeout=10.0):
+        """Send a request and return (status, reason, headers, body_bytes)."""
+        parts = urllib_parse.urlsplit(url)
+        key = (parts.hostname, parts.port or 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        attempt = 0
+        while True:
+            pool = self._pool()
+            conn = pool.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = pool[key] = http.client.HTTPConnection(key[0], key[1], timeout=timeout)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except CONNECTION_RESET_ERRORS:
+                self._drop(key)
+                if attempt >= self.max_retries or not (reused or method == "GET"):
+                    raise
+                attempt += 1
+                continue
+            except Exception:
+                self._drop(key)
+                raise
+            if resp.will_close:
+                self._drop(key)
+            self._count(len(body or b""), len(data))
+            return resp.status, resp.reason, resp.headers, data
+
+    def request_json(self, method, url, payload=None, timeout=10.0):
+        headers = {"Accept": "application/json"}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        status, reason, resp_headers, data = self.request(method, url, body=body, headers=headers, timeout=timeout)
+        if status >= 400:
+            raise urllib_error.HTTPError(url, status, reason, resp_headers, io.BytesIO(data))
+        return json.loads(data.decode("utf-8"))
+
+    def close(self):
+        pool = self._pool()
+        for key in list(pool):
+            self._drop(key)
+
+HTTP_CLIENT = KeepAliveClient()
+
 def http_get_json(url, timeout=5.0):
-    req = urllib_request.Request(url, headers={"Accept": "application/json"})
-    with urllib_request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read().decode("utf-8")
-        return json.loads(data)
+    return HTTP_CLIENT.request_json("GET", url, timeout=timeout)
 
 def http_post_json(url, payload, timeout=10.0):
-    body = json.dumps(payload).encode("utf-8")
-    req = urllib_request.Request(url, data=body, headers={"Content-Type": "application/json", "Accept": "application/json"})
-    with urllib_request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read().decode("utf-8")
-        return json.loads(data)
-
-def wait_for_health(health_url, expect_service_substr="Python Flask Backend", timeout_seconds=60):
-    start = time.time()
+    return HTTP_CLIENT.request_json("POST", url, payload, timeout=timeout)
+
+# -------------------------
+# Backend readiness
+# -------------------------
+
+class BackendExitedError(RuntimeError):
+    pass
+
+def check_backend_alive(proc):
+    if proc is not None and proc.poll() is not None:
+        raise BackendExitedError(f"Backend process exited with code {proc.returncode} before becoming ready")
+
+def wait_for_health(health_url, expect_service_substr=HEALTH_SERVICE_MARKER, timeout_seconds=60, proc=None):
+    """Probe /health with exponential backoff; fail fast if proc exits."""
+    start = time.monotonic()
+    delay = PROBE_BACKOFF_INITIAL
     while True:
+        check_backend_alive(proc)
         try:
             data = http_get_json(health_url, timeout=2.0)
             if not expect_service_substr or expect_service_substr in str(data):
                 return data
         except Exception:
             pass
-        if time.time() - start > timeout_seconds:
+        if time.monotonic() - start > timeout_seconds:
             raise TimeoutError(f"Service did not become healthy within {timeout_seconds} seconds at {health_url}")
-        time.sleep(0.5)
+        time.sleep(delay)
+        delay = min(delay * 2, PROBE_BACKOFF_MAX)
+
+def wait_for_ready(proc, host, port, health_url, drainer=None, expect_service_substr=HEALTH_SERVICE_MARKER, timeout_seconds=60):
+    """Wait until a launched backend is serving.
+
+    Waits on the drainer's bind-message event and the port for an accepting
+    socket, failing fast if the process exits, then confirms with /health.
+    Returns (health, startup) where startup holds latencies in seconds from the call.
+    """
+    start = time.monotonic()
+    startup = {"bind_message_s": None, "socket_open_s": None, "healthy_s": None}
+    while True:
+        check_backend_alive(proc)
+        if drainer is not None and startup["bind_message_s"] is None and drainer.bind_event.is_set():
+            startup["bind_message_s"] = round(time.monotonic() - start, 3)
+        if port_is_open(host, port, timeout=READY_POLL_INTERVAL):
+            startup["socket_open_s"] = round(time.monotonic() - start, 3)
+            break
+        if time.monotonic() - start > timeout_seconds:
+            raise TimeoutError(f"Backend did not open {host}:{port} within {timeout_seconds} seconds")
+        if drainer is not None and startup["bind_message_s"] is None:
+            drainer.bind_event.wait(READY_POLL_INTERVAL)
+        else:
+            time.sleep(READY_POLL_INTERVAL)
+    remaining = max(timeout_seconds - (time.monotonic() - start), 1.0)
+    health = wait_for_health(health_url, expect_service_substr=expect_service_substr, timeout_seconds=remaining, proc=proc)
+    startup["healthy_s"] = round(time.monotonic() - start, 3)
+    return health, startup
 
 # -------------------------
-# Main Orchestration
+# Child output
 # -------------------------
 
-def main():
-    # 1) Locate and unzip the project
-    zip_path = find_first_zip(".")
-    if not zip_path:
-        raise FileNotFoundError("No .zip file found in current directory. Place the project zip next to this script or pass its path as an argument.")
-    log(f"[INFO] Using project zip: {zip_path}")
-    extracted_root = unzip_project(zip_path)
+class LogDrainer:
+    """Drains a child's merged stdout/stderr on a background thread.
 
-    # Try to derive a friendly project root (handle nested single folder case)
-    # If the zip extracts a single top-level folder, point extracted_root there
-    top_items = [os.path.join(extracted_root, name) for name in os.listdir(extracted_root)]
-    top_dirs = [p for p in top_items if os.path.isdir(p)]
-    if len(top_dirs) == 1 and not any(os.path.isfile(p) for p in top_items):
-        project_root = top_dirs[0]
-    else:
-        project_root = extracted_root
-    log(f"[INFO] Project root resolved to: {project_root}")
-
-    # 2) Detect backend entry and dependencies
-    backend_dir = locate_backend_dir(project_root)
-    app_path = os.path.join(backend_dir, BACKEND_APP_FILENAME)
-    requirements_path = os.path.join(backend_dir, REQUIREMENTS_FILENAME)
-    if not os.path.isfile(app_path):
-        raise FileNotFoundError(f"Could not find backend app at: {app_path}")
-    if not os.path.isfile(requirements_path):
-        log(f"[WARN] Missing requirements.txt at: {requirements_path} (will try running without installing dependencies)")
-
-    # 3) Create and prepare venv
-    venv_dir = os.path.join(backend_dir, VENV_DIRNAME)
-    if os.path.exists(venv_dir):
-        log(f"[INFO] Removing existing venv: {venv_dir}")
-        shutil.rmtree(venv_dir, ignore_errors=True)
-    create_venv(venv_dir)
+    The child never blocks on a full pipe; the last max_lines lines stay in a
+    ring buffer and, if spool_path is given, every line is also written there.
+    bind_event is set once a line matches BIND_MESSAGE_PATTERNS. Lines for
+    which line_filter returns True are consumed by it and not kept.
+    """
+
+    def __init__(self, stream, max_lines=LOG_RING_LINES, spool_path=None, line_filter=None):
+        self.stream = stream
+        self.spool_path = spool_path
+        self.line_filter = line_filter
+        self.lines = collections.deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.bind_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-drainer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        spool = open(self.spool_path, "w", encoding="utf-8") if self.spool_path else None
+        try:
+            for line in self.stream:
+                line = line.rstrip("\n")
+                if self.line_filter is not None and self.line_filter(line):
+                    continue
+                self.lines.append(line)
+                self.total_lines += 1
+                if spool is not None:
+                    spool.write(line + "\n")
+                    spool.flush()
+                if not self.bind_event.is_set() and any(p in line for p in BIND_MESSAGE_PATTERNS):
+                    self.bind_event.set()
+        except ValueError:
+            pass  # stream closed under us during shutdown
+        finally:
+            if spool is not None:
+                spool.close()
+
+    def tail(self, n=50):
+        # Beyond the ring buffer, read the spool backwards from its end
+        if n > len(self.lines) and self.total_lines > len(self.lines) and self.spool_path:
+            return tail_file(self.spool_path, n)
+        return list(self.lines)[-n:]
+
+    def contains(self, text):
+        return any(text in line for line in self.lines)
+
+    def join(self, timeout=5.0):
+        self._thread.join(timeout)
+
+def tail_file(path, n=50, block_size=8192):
+    """Return the last n lines of a file, reading backwards from the end in blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= n:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines()[-n:]]
+
+def print_log_tail(drainer, n=50):
+    lines = drainer.tail(n)
+    if not lines:
+        return
+    print("\n===== SERVER LOG (tail) =====")
+    for line in lines:
+        print(line.rstrip())
+
+# -------------------------
+# Startup profiling
+# -------------------------
+
+class ImportTimeProfile:
+    """Collects `python -X importtime` lines from a backend's stderr.
+
+    Use feed() as a LogDrainer line_filter: import-time lines are parsed and
+    kept out of the log, everything else passes through.
+    """
+
+    PREFIX = "import time:"
+
+    def __init__(self):
+        self.entries = []  # (module, depth, self_us, cumulative_us) in completion order
+
+    def feed(self, line):
+        if not line.startswith(self.PREFIX):
+            return False
+        try:
+            self_us, cumulative_us, name = line[len(self.PREFIX):].split("|", 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            return True  # the "self [us] | cumulative | imported package" header
+        module = name.strip()
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        self.entries.append((module, depth, self_us, cumulative_us))
+        return True
+
+    def report(self, startup, top=IMPORT_PROFILE_TOP):
+        """Ranked heaviest imports plus startup phases, combined with wait_for_ready's latencies."""
+        entries = list(self.entries)
+        top_level = [e for e in entries if e[1] == 0]
+        total_us = sum(e[3] for e in top_level)
+
+        def as_rows(rows):
+            return [{"module": m, "self_ms": round(s / 1000, 2), "cumulative_ms": round(c / 1000, 2)}
+                    for m, _, s, c in rows]
+
+        imports_s = total_us / 1e6
+        listen_s = startup.get("socket_open_s")
+        healthy_s = startup.get("healthy_s")
+        phases = [{"phase": "imports", "s": round(imports_s, 3)}]
+        if listen_s is not None:
+            phases.append({"phase": "interpreter_and_app_init", "s": round(max(0.0, listen_s - imports_s), 3)})
+            if healthy_s is not None:
+                phases.append({"phase": "listen_to_healthy", "s": round(healthy_s - listen_s, 3)})
+        return {
+            "time_to_listen_s": listen_s,
+            "modules_imported": len(entries),
+            "total_import_ms": round(total_us / 1000, 2),
+            "phases": sorted(phases, key=lambda p: p["s"], reverse=True),
+            "heaviest_top_level": as_rows(sorted(top_level, key=lambda e: e[3], reverse=True)[:top]),
+            "heaviest_self": as_rows(sorted(entries, key=lambda e: e[2], reverse=True)[:top]),
+        }
+
+def format_import_profile(profile, top=10):
+    lines = [f"Time to listen: {profile['time_to_listen_s']}s; {profile['modules_imported']} modules imported "
+             f"in {profile['total_import_ms']} ms"]
+    lines += [f"  phase {p['phase']:<20} {p['s']:>8.3f}s" for p in profile["phases"]]
+    lines += [f"  import {r['module']:<40} {r['cumulative_ms']:>9.1f} ms" for r in profile["heaviest_top_level"][:top]]
+    return "\n".join(lines)
+
+# -------------------------
+# Backend launch
+# -------------------------
+
+def allocate_port(host=HOST):
+    """Ask the OS for a free TCP port on host."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+def backend_urls(host, port):
+    base = f"http://{host}:{port}"
+    return {
+        "base": base,
+        "health": base + HEALTH_ROUTE,
+        "chat": base + CHAT_ROUTE,
+        "reset": base + RESET_ROUTE,
+    }
+
+def spawn_backend(venv_python, app_path, backend_dir, log_path, host, port, import_profile=None):
+    """Start app.py through LAUNCH_SHIM with the port injected via env and argv.
+
+    Returns (proc, drainer); the drainer spools the child's output to log_path.
+    With an ImportTimeProfile the child runs under -X importtime and the profile
+    consumes those lines.
+    """
+    child_env = dict(os.environ, PYTHONUNBUFFERED="1", RUNNER_HOST=host)
+    for name in PORT_ENV_VARS:
+        child_env[name] = str(port)
+    # Unbuffered so the bind message reaches the drainer promptly
+    cmd = [venv_python, "-c", LAUNCH_SHIM, app_path]
+    if import_profile is not None:
+        cmd[1:1] = ["-X", "importtime"]
+    proc = subprocess.Popen(cmd, cwd=backend_dir,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", errors="replace", env=child_env)
+    drainer = LogDrainer(proc.stdout, spool_path=log_path,
+                         line_filter=import_profile.feed if import_profile is not None else None).start()
+    return proc, drainer
+
+def launch_backend(venv_python, app_path, backend_dir, log_path, host=HOST, timeout_seconds=60, profile_imports=False):
+    """Launch the backend on a freshly allocated port and wait until it is ready.
+
+    Retries on another port if the chosen one was taken before the child bound it.
+    Returns (proc, drainer, urls, health, startup); with profile_imports,
+    startup["profile"] holds the ranked import-time report.
+    """
+    for attempt in range(1, LAUNCH_ATTEMPTS + 1):
+        port = allocate_port(host)
+        urls = backend_urls(host, port)
+        import_profile = ImportTimeProfile() if profile_imports else None
+        proc, drainer = spawn_backend(venv_python, app_path, backend_dir, log_path, host, port, import_profile)
+        log(f"[INFO] Backend process started (PID={proc.pid}) on port {port}. Waiting for readiness...")
+        try:
+            health, startup = wait_for_ready(proc, host, port, urls["health"], drainer=drainer,
+                                             expect_service_substr=HEALTH_SERVICE_MARKER, timeout_seconds=timeout_seconds)
+        except BackendExitedError:
+            drainer.join()
+            if drainer.contains("Address already in use") and attempt < LAUNCH_ATTEMPTS:
+                log(f"[WARN] Port {port} was taken before the backend bound it; retrying on a new port")
+                continue
+            print_log_tail(drainer)
+            raise
+        except TimeoutError:
+            proc.kill()
+            drainer.join()
+            print_log_tail(drainer)
+            raise
+        startup["port"] = port
+        if import_profile is not None:
+            startup["profile"] = import_profile.report(startup)
+            log("[INFO] Startup profile:\n" + format_import_profile(startup["profile"]))
+        log(f"[INFO] Backend ready: bind message at {startup['bind_message_s']}s, "
+            f"socket open at {startup['socket_open_s']}s, healthy at {startup['healthy_s']}s")
+        return proc, drainer, urls, health, startup
+
+# -------------------------
+# Resource accounting
+# -------------------------
+
+class ResourceLimitExceeded(RuntimeError):
+    pass
+
+def read_rss_bytes(pid):
+    """Resident set size of pid from /proc, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def read_cpu_seconds(pid):
+    """User+system CPU seconds of pid from /proc/<pid>/stat, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="ascii") as f:
+            # The command name may contain spaces; fields after it are space-separated
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def count_open_fds(pid):
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+
+def process_tree(pid):
+    """pid plus all of its live descendants, found through /proc/<pid>/task/*/children."""
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        try:
+            tasks = os.listdir(f"/proc/{current}/task")
+        except OSError:
+            continue
+        for tid in tasks:
+            try:
+                with open(f"/proc/{current}/task/{tid}/children", "r", encoding="ascii") as f:
+                    stack.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                pass
+    return tree
+
+def dir_size_bytes(path):
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            pass
+    return total
+
+def apply_rlimits(pid, limits, pooled=False):
+    """Set hard kernel backstops on the launched process where resource.prlimit exists (Linux).
+
+    RLIMIT_CPU counts CPU over the process's whole life, so it is left off a pooled
+    backend that serves many jobs; the monitor enforces cpu_s per job there.
+    """
+    if resource is None or not hasattr(resource, "prlimit"):
+        return
+    backstops = (("open_fds", "RLIMIT_NOFILE"),) if pooled else (("open_fds", "RLIMIT_NOFILE"), ("cpu_s", "RLIMIT_CPU"))
+    for limit_name, rlimit in backstops:
+        value = limits.get(limit_name)
+        if not value or not hasattr(resource, rlimit):
+            continue
+        # A little above the monitor's ceiling, so the monitor normally trips first and reports why
+        value = int(value * 1.25) + 1
+        try:
+            soft, hard = resource.prlimit(pid, getattr(resource, rlimit))
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.prlimit(pid, getattr(resource, rlimit), (value, value))
+        except (OSError, ValueError) as e:
+            log(f"[WARN] Could not set {rlimit} on PID {pid}: {e}")
+
+class ResourceMonitor:
+    """Samples a backend's process tree from /proc on a background thread.
+
+    Tracks CPU seconds, peak RSS and peak open fds across the tree, and the
+    bytes written to the backend's output/ directory. When a configured
+    ceiling in `limits` (cpu_s, rss_bytes, open_fds, output_bytes) is crossed,
+    the whole tree is killed and check() raises ResourceLimitExceeded.
+    begin_job() restarts the accounting window, so pooled backends report
+    and are held to the ceilings per job.
+    """
+
+    def __init__(self, proc, output_dir, limits=None, interval=RESOURCE_SAMPLE_INTERVAL, pooled=False):
+        self.proc = proc
+        self.output_dir = output_dir
+        self.pooled = pooled
+        self.limits = {k: v for k, v in (limits or {}).items() if v}
+        self.interval = interval
+        self.violation = None
+        self.samples = 0
+        self._cpu = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"monitor-{proc.pid}")
+        self.begin_job()
+
+    def start(self):
+        apply_rlimits(self.proc.pid, self.limits, self.pooled)
+        self._thread.start()
+        return self
+
+    def begin_job(self):
+        with self._lock:
+            self._begin_job()
+
+    def _begin_job(self):
+        self._cpu_base = sum(self._cpu.values())
+        self._output_base = dir_size_bytes(self.output_dir)
+        self.usage = {"cpu_s": 0.0, "rss_bytes": 0, "open_fds": 0, "output_bytes": 0}
+        self.peak = dict(self.usage)
+
+    def sample(self):
+        with self._lock:
+            self._sample()
+
+    def _sample(self):
+        tree = process_tree(self.proc.pid)
+        rss = fds = 0
+        for pid in tree:
+            cpu = read_cpu_seconds(pid)
+            if cpu is not None:
+                # Keep the last reading of exited children so their CPU is not lost
+                self._cpu[pid] = cpu
+            rss += read_rss_bytes(pid) or 0
+            fds += count_open_fds(pid) or 0
+        self.usage = {
+            "cpu_s": round(sum(self._cpu.values()) - self._cpu_base, 3),
+            "rss_bytes": rss,
+            "open_fds": fds,
+            "output_bytes": max(0, dir_size_bytes(self.output_dir) - self._output_base),
+            "processes": len(tree),
+        }
+        for key, value in self.usage.items():
+            self.peak[key] = max(self.peak.get(key, 0), value)
+        self.samples += 1
+        for key, ceiling in self.limits.items():
+            if self.usage.get(key, 0) > ceiling and self.violation is None:
+                self.violation = f"{key}={self.usage[key]} exceeded the ceiling of {ceiling}"
+                log(f"[ERROR] Backend (PID={self.proc.pid}) {self.violation}; killing its process tree")
+                self.kill_tree(tree)
+
+    def kill_tree(self, tree):
+        for pid in reversed(tree):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.proc.poll() is not None:
+                break
+            self.sample()
+
+    def check(self):
+        if self.violation:
+            raise ResourceLimitExceeded(self.violation)
+
+    def report(self):
+        if self.proc.poll() is None:
+            self.sample()
+        return {
+            "cpu_s": self.usage["cpu_s"],
+            "peak_rss_bytes": self.peak["rss_bytes"],
+            "peak_open_fds": self.peak["open_fds"],
+            "output_bytes": self.usage["output_bytes"],
+            "peak_processes": self.peak.get("processes", 0),
+            "output_dir": self.output_dir,
+            "samples": self.samples,
+            "limits": self.limits,
+            "violation": self.violation,
+        }
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=self.interval + 1)
+
+# -------------------------
+# Warm backend pool
+# -------------------------
+
+class LaunchedBackend:
+    """A running backend process together with what is needed to talk to it and stop it."""
+
+    def __init__(self, proc, drainer, urls, backend_dir, key=None, limits=None):
+        self.proc = proc
+        self.drainer = drainer
+        self.urls = urls
+        self.backend_dir = backend_dir
+        self.key = key
+        self.jobs = 0
+        self.rss_baseline = read_rss_bytes(proc.pid)
+        # A key means the backend may go back to the pool and serve further jobs
+        self.monitor = ResourceMonitor(proc, os.path.join(backend_dir, OUTPUT_DIRNAME), limits,
+                                       pooled=key is not None).start()
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def stop(self):
+        self.monitor.stop()
+        stop_backend(self.proc, self.drainer)
+
+def backend_env_key(backend_dir, prune_dirs=None):
+    """Hash of requirements.txt and the backend's Python sources; equal keys can share a warm backend."""
+    prune_dirs = DEFAULT_PRUNE_DIRS | OUTPUT_DIR_NAMES if prune_dirs is None else prune_dirs
+    digest = hashlib.sha256()
+    stack = [backend_dir]
+    files = []
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_pruned_dir(entry, prune_dirs):
+                        stack.append(entry.path)
+                elif entry.name == REQUIREMENTS_FILENAME or entry.name.endswith(".py"):
+                    files.append(entry.path)
+    for path in sorted(files):
+        digest.update(os.path.relpath(path, backend_dir).encode("utf-8") + b"\0")
+        digest.update(file_sha256(path).encode("ascii"))
+    return digest.hexdigest()
+
+class BackendPool:
+    """Keeps up to `size` idle backends alive per environment key and hands them to later jobs.
+
+    A returned backend is /reset before it is handed out again. It is recycled
+    (stopped) after `max_jobs` jobs, when its RSS grew by more than
+    `max_rss_growth` bytes since launch, or when the key already has `size`
+    idle backends.
+    """
+
+    def __init__(self, size=1, max_jobs=DEFAULT_POOL_MAX_JOBS, max_rss_growth=DEFAULT_POOL_MAX_RSS_GROWTH):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_rss_growth = max_rss_growth
+        self.stats = {"hits": 0, "misses": 0, "recycled": 0}
+        self._idle = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def has_idle(self, key):
+        """Whether an idle backend is waiting for key; acquire() may still miss if another job takes it."""
+        with self._lock:
+            return bool(self._idle.get(key))
+
+    def acquire(self, key):
+        """Return (backend, health) of a reset warm backend for key, or (None, None)."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                backend = idle.pop() if idle else None
+                if backend is None:
+                    self.stats["misses"] += 1
+                    return None, None
+            try:
+                if not backend.alive():
+                    raise BackendExitedError(f"pooled backend exited with code {backend.proc.returncode}")
+                previous = http_get_json(backend.urls["health"], timeout=5.0)
+                health = start_new_session(backend.urls, previous.get("session_id"))
+            except Exception as e:
+                log(f"[WARN] Discarding pooled backend (PID={backend.proc.pid}): {e}")
+                self._recycle(backend)
+                continue
+            with self._lock:
+                self.stats["hits"] += 1
+            log(f"[INFO] Reusing warm backend (PID={backend.proc.pid}, jobs so far={backend.jobs})")
+            return backend, health
+
+    def release(self, backend, reusable=True):
+        """Return a backend after a job; stops it instead when it should not be reused."""
+        backend.jobs += 1
+        reason = None
+        rss = read_rss_bytes(backend.proc.pid)
+        if not reusable or not backend.alive():
+            reason = "job did not finish cleanly"
+        elif backend.jobs >= self.max_jobs:
+            reason = f"served {backend.jobs} jobs"
+        elif rss and backend.rss_baseline and rss - backend.rss_baseline > self.max_rss_growth:
+            reason = f"RSS grew by {(rss - backend.rss_baseline) // (1024 * 1024)} MiB"
+        if reason is None:
+            with self._lock:
+                if len(self._idle[backend.key]) < self.size:
+                    self._idle[backend.key].append(backend)
+                    return
+            reason = "pool is full for this environment"
+        log(f"[INFO] Recycling backend (PID={backend.proc.pid}): {reason}")
+        self._recycle(backend)
+
+    def _recycle(self, backend):
+        with self._lock:
+            self.stats["recycled"] += 1
+        backend.stop()
+
+    def close(self):
+        with self._lock:
+            backends = [b for idle in self._idle.values() for b in idle]
+            self._idle.clear()
+        for backend in backends:
+            backend.stop()
+
+# -------------------------
+# Load stage
+# -------------------------
+
+def load_worker(chat_url, prompts, offset, stop_at, stopped, latencies, errors):
+    """One simulated user: send prompts back to back over its own keep-alive connection until stop_at."""
+    i = offset
+    try:
+        while time.monotonic() < stop_at and not stopped.is_set():
+            started = time.monotonic()
+            try:
+                http_post_json(chat_url, {CHAT_REQUEST_FIELD: prompts[i % len(prompts)]}, timeout=LOAD_REQUEST_TIMEOUT)
+                latencies.append(time.monotonic() - started)
+            except REQUEST_ERRORS as e:
+                errors[type(e).__name__] += 1
+            i += 1
+    finally:
+        HTTP_CLIENT.close()
+
+def load_prompts(suite_path=None, limit=LOAD_MAX_PROMPTS):
+    """The first `limit` prompts of the suite for the load clients to cycle through.
+
+    Falls back to the built-in inputs without a suite or when it holds no prompts,
+    so the list is never empty.
+    """
+    prompts = []
+    if suite_path:
+        prompts = [item["prompt"] for item in itertools.islice(iter_suite(suite_path), limit)]
+        if not prompts:
+            log(f"[WARN] Suite {suite_path} has no prompts; the load stage uses the built-in inputs")
+    return prompts or BATCH_INPUTS[:limit]
+
+def run_load(backend, concurrency, duration, prompts=BATCH_INPUTS, sample_interval=0.25):
+    """Drive the backend with `concurrency` concurrent clients for `duration` seconds.
+
+    Returns the performance section: throughput, latency percentiles, error
+    rate and the backend process's CPU time and peak RSS over the window.
+    """
+    pid = backend.proc.pid
+    latencies = [[] for _ in range(concurrency)]
+    errors = [collections.Counter() for _ in range(concurrency)]
+    rss_start = rss_peak = read_rss_bytes(pid)
+    cpu_start = read_cpu_seconds(pid)
+    log(f"[INFO] Load stage: {concurrency} concurrent client(s) for {duration:.0f}s")
+    started = time.monotonic()
+    stop_at = started + duration
+    stopped = threading.Event()
+    workers = [threading.Thread(target=load_worker, daemon=True, name=f"load-{n}",
+                                args=(backend.urls["chat"], prompts, n, stop_at, stopped, latencies[n], errors[n]))
+               for n in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        time.sleep(sample_interval)
+        rss = read_rss_bytes(pid)
+        if rss is not None:
+            rss_peak = max(rss_peak or 0, rss)
+        if not backend.alive() and not stopped.is_set():
+            log(f"[WARN] Backend exited during the load stage (code {backend.proc.returncode}); stopping load")
+            stopped.set()
+    elapsed = time.monotonic() - started
+    cpu_end = read_cpu_seconds(pid)
+
+    ok = sorted(v for per_worker in latencies for v in per_worker)
+    error_counts = sum(errors, collections.Counter())
+    total = len(ok) + sum(error_counts.values())
+    cpu_s = cpu_end - cpu_start if cpu_start is not None and cpu_end is not None else None
+    performance = {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": total,
+        "errors": dict(error_counts),
+        "error_rate": round(sum(error_counts.values()) / total, 4) if total else None,
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            name: round(percentile(ok, pct) * 1000, 2) if ok else None
+            for name, pct in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "backend": {
+            "pid": pid,
+            "cpu_s": round(cpu_s, 3) if cpu_s is not None else None,
+            "cpu_util": round(cpu_s / elapsed, 3) if cpu_s is not None and elapsed else None,
+            "rss_start_bytes": rss_start,
+            "rss_peak_bytes": rss_peak,
+        },
+    }
+    log(f"[INFO] Load stage: {performance['throughput_rps']} req/s, p50={performance['latency_ms']['p50']}ms, "
+        f"p99={performance['latency_ms']['p99']}ms, error rate={performance['error_rate']}")
+    return performance
+
+# -------------------------
+# Timing trace
+# -------------------------
+
+def children_cpu_seconds():
+    # CPU used by waited-for child processes (pip, venv); process-wide, so
+    # concurrent cohort jobs see each other's children.
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class Tracer:
+    """Records timing spans for one run and appends them to a JSONL trace file.
+
+    Each span carries wall time, this thread's CPU time, child-process CPU time
+    and the HTTP bytes this thread sent and received while it was open.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.path = None
+        self.spans = []
+        self._fp = None
+        self._origin = time.perf_counter()
+
+    def open(self, path):
+        """Start writing to path; spans recorded before this call are flushed first."""
+        self.path = path
+        self._fp = open(path, "w", encoding="utf-8")
+        for record in self.spans:
+            self._write(record)
+
+    def _write(self, record):
+        self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fp.flush()
+
+    @contextlib.contextmanager
+    def span(self, name, **attrs):
+        record = {"run_id": self.run_id, "name": name}
+        record.update(attrs)
+        wall0 = time.perf_counter()
+        cpu0 = time.thread_time()
+        child0 = children_cpu_seconds()
+        sent0, received0 = HTTP_CLIENT.traffic()
+        record["status"] = "ok"
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            sent1, received1 = HTTP_CLIENT.traffic()
+            child1 = children_cpu_seconds()
+            record["start_s"] = round(wall0 - self._origin, 6)
+            record["wall_s"] = round(time.perf_counter() - wall0, 6)
+            record["cpu_s"] = round(time.thread_time() - cpu0, 6)
+            record["child_cpu_s"] = round(child1 - child0, 6) if child0 is not None else None
+            record.setdefault("bytes_sent", sent1 - sent0)
+            record.setdefault("bytes_received", received1 - received0)
+            self.spans.append(record)
+            if self._fp is not None:
+                self._write(record)
+
+    def phase_timings(self):
+        return {r["name"]: r["wall_s"] for r in self.spans if r["name"] != "chat_turn"}
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+def find_trace_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in DEFAULT_PRUNE_DIRS | BUILD_OUTPUT_DIRS and not d.startswith(".venv")]
+                if TRACE_FILENAME in files:
+                    yield os.path.join(root, TRACE_FILENAME)
+        elif os.path.isfile(path):
+            yield path
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def summarize_traces(trace_paths):
+    """Aggregate spans from many trace files into per-phase statistics."""
+    walls, cpus, bytes_moved, runs = {}, {}, {}, set()
+    for path in trace_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                name = record["name"]
+                runs.add((path, record.get("run_id")))
+                walls.setdefault(name, []).append(record["wall_s"])
+                cpus.setdefault(name, []).append(record["cpu_s"] + (record.get("child_cpu_s") or 0.0))
+                bytes_moved[name] = bytes_moved.get(name, 0) + record.get("bytes_sent", 0) + record.get("bytes_received", 0)
+    phases = {}
+    for name, values in walls.items():
+        values.sort()
+        phases[name] = {
+            "count": len(values),
+            "total_s": round(sum(values), 3),
+            "mean_s": round(sum(values) / len(values), 4),
+            "p50_s": round(percentile(values, 50), 4),
+            "p95_s": round(percentile(values, 95), 4),
+            "max_s": round(values[-1], 4),
+            "cpu_mean_s": round(sum(cpus[name]) / len(cpus[name]), 4),
+            "bytes": bytes_moved[name],
+        }
+    return {"runs": len(runs), "phases": phases}
+
+def format_trace_table(summary):
+    header = f"{'phase':<18}{'count':>7}{'total s':>10}{'mean s':>10}{'p50 s':>9}{'p95 s':>9}{'max s':>9}{'cpu s':>9}{'bytes':>12}"
+    lines = [f"Runs aggregated: {summary['runs']}", header, "-" * len(header)]
+    for name, p in sorted(summary["phases"].items(), key=lambda kv: -kv[1]["total_s"]):
+        lines.append(f"{name:<18}{p['count']:>7}{p['total_s']:>10.3f}{p['mean_s']:>10.4f}{p['p50_s']:>9.4f}"
+                     f"{p['p95_s']:>9.4f}{p['max_s']:>9.4f}{p['cpu_mean_s']:>9.4f}{p['bytes']:>12}")
+    return "\n".join(lines)
+
+# -------------------------
+# Results stream
+# -------------------------
+
+class ResultsWriter:
+    """Append-only JSONL results file; each record is flushed as soon as it is written.
+
+    Record types: "turn" (one per chat turn), "session" (one per suite session,
+    after its output file is collected) and a final "summary". Only running
+    totals are kept in memory, so suite size does not affect the footprint.
+
+    With resume=True an existing file is kept for the suite sessions that
+    finished: their session record was written and none of their turns errored.
+    Their positions in the suite are collected into .completed and the totals
+    start from them. Every other record is dropped: a backend session cannot be
+    continued after a restart, so an unfinished session runs again from its
+    first turn in a new one.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.turns = 0
+        self.turn_errors = 0
+        self.sessions = 0
+        self.completed = set()
+        if resume and os.path.isfile(path):
+            truncate_torn_tail(path)
+            self._keep_completed_sessions(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _keep_completed_sessions(self, path):
+        # Backend session ids tell the turns of a finished run apart from those of an interrupted one
+        recorded, failed = {}, set()
+        for record in iter_results(path):
+            if record.get("type") == "session":
+                recorded[record["session_id"]] = record.get("position")
+            elif record.get("type") == "turn" and "error" in record:
+                failed.add(record["session_id"])
+        finished = set(recorded) - failed
+        self.completed = {recorded[session_id] for session_id in finished}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for record in iter_results(path):
+                if record.get("type") not in ("turn", "session") or record["session_id"] not in finished:
+                    continue
+                if record["type"] == "turn":
+                    self.turns += 1
+                else:
+                    self.sessions += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+
+    def write(self, record_type, record):
+        if record_type == "turn":
+            self.turns += 1
+            self.turn_errors += "error" in record
+        elif record_type == "session":
+            self.sessions += 1
+        self._file.write(json.dumps({"type": record_type, **record}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def totals(self):
+        return {"sessions": self.sessions, "turns": self.turns, "turn_errors": self.turn_errors}
+
+    def close(self):
+        self._file.close()
+
+def truncate_torn_tail(path):
+    """Cut a partially written last line (left by a crash) so appends start on a clean line."""
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        block = 4096
+        pos = size
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+def iter_results(path, record_type=None):
+    """Yield records from a results JSONL file, optionally only those of one type."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a torn last line; everything before it is intact
+                break
+            if record_type is None or record.get("type") == record_type:
+                yield record
+
+# -------------------------
+# Checkpoints
+# -------------------------
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_checkpoint(project_root):
+    path = os.path.join(project_root, CHECKPOINT_FILENAME)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"[WARN] Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+def find_resumable_root(zip_path, extract_to=None):
+    """Return (project_root, checkpoint) of an earlier extraction of this exact zip, or (None, None)."""
+    extract_to = extract_to or default_extract_dir(zip_path)
+    if not os.path.isdir(extract_to):
+        return None, None
+    project_root = resolve_project_root(extract_to)
+    checkpoint = load_checkpoint(project_root)
+    if not checkpoint:
+        return None, None
+    if checkpoint.get("zip_sha256") != file_sha256(zip_path):
+        log("[WARN] Checkpoint belongs to a different zip; starting fresh")
+        return None, None
+    return project_root, checkpoint
+
+def env_is_reusable(checkpoint, venv_dir, requirements_path):
+    env = checkpoint.get("env") or {}
+    requirements_sha = file_sha256(requirements_path) if os.path.isfile(requirements_path) else None
+    return (env.get("ready")
+            and env.get("venv_dir") == venv_dir
+            and env.get("requirements_sha256") == requirements_sha
+            and os.path.isfile(venv_python_path(venv_dir)))
+
+def install_environment(venv_dir, requirements_path, project_root, checkpoint, checkpoint_path, deadline, tracer):
+    """Create the venv from scratch, install requirements.txt and record the ready env in the checkpoint."""
     venv_python = venv_python_path(venv_dir)
+    with tracer.span("venv"):
+        if os.path.exists(venv_dir):
+            log(f"[INFO] Removing existing venv: {venv_dir}")
+            shutil.rmtree(venv_dir, ignore_errors=True)
+        create_venv(venv_dir, deadline)
     venv_pip = venv_pip_path(venv_dir)
 
     # Upgrade pip for robustness
     try:
-        subprocess.check_call([venv_pip, "install", "--upgrade", "pip", "setuptools", "wheel"])
+        with tracer.span("pip_upgrade"):
+            run_checked([venv_pip, "install", "--upgrade", "pip", "setuptools", "wheel"], deadline)
     except subprocess.CalledProcessError:
         log("[WARN] Could not upgrade pip/setuptools/wheel; proceeding")
 
     # Install dependencies
     if os.path.isfile(requirements_path):
-        install_requirements(venv_pip, requirements_path)
+        with tracer.span("pip_install"):
+            install_requirements(venv_pip, requirements_path, deadline)
+    requirements_sha = file_sha256(requirements_path) if os.path.isfile(requirements_path) else None
+
+    # Warm bytecode for site-packages and the project, so the first launch does not compile it
+    with tracer.span("precompile"):
+        precompile_environment(venv_python, venv_dir, project_root, deadline)
+    checkpoint["env"] = {
+        "venv_dir": venv_dir,
+        "python": venv_python,
+        "requirements_sha256": requirements_sha,
+        "ready": True,
+    }
+    write_json_atomic(checkpoint_path, checkpoint)
+
+# -------------------------
+# Job scheduling
+# -------------------------
+
+class JobTimeout(Exception):
+    pass
+
+class Deadline:
+    """A job's time budget; remaining() feeds subprocess and wait timeouts."""
+
+    def __init__(self, seconds=None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self, cap=None):
+        if self.expires_at is None:
+            return cap
+        left = self.expires_at - time.monotonic()
+        if left <= 0:
+            raise JobTimeout("Job exceeded its time budget")
+        return left if cap is None else min(left, cap)
+
+class StageLimits:
+    """Per-stage semaphores so I/O-bound and CPU-bound stages get separate concurrency."""
 
-    # 4) Launch backend (Flask app.py)
-    server_log_path = os.path.join(backend_dir, "server.log")
-    log(f"[INFO] Launching backend: {app_path}")
-    using_existing_server = False
+    def __init__(self, limits=None):
+        limits = dict(DEFAULT_STAGE_LIMITS, **(limits or {}))
+        self.limits = limits
+        self._semaphores = {name: threading.BoundedSemaphore(n) for name, n in limits.items()}
 
-    if port_is_open(HOST, PORT):
-        # Check if it's the expected service
+    @contextlib.contextmanager
+    def stage(self, name, deadline=None):
+        sem = self._semaphores[name]
+        timeout = deadline.remaining() if deadline is not None else None
+        if not sem.acquire(timeout=timeout):
+            raise JobTimeout(f"Job timed out waiting for a '{name}' slot")
         try:
-            health = http_get_json(HEALTH_URL, timeout=2.0)
-            if "service" in health and "Python Flask Backend" in str(health.get("service", "")):
-                using_existing_server = True
-                log(f"[INFO] Reusing existing running backend on port {PORT} (session_id={health.get('session_id')})")
-            else:
-                log(f"[WARN] Port {PORT} is in use by another service; attempting to proceed anyway.")
-        except Exception:
-            log(f"[WARN] Port {PORT} is open but health check failed; attempting to proceed.")
-
-    proc = None
-    if not using_existing_server:
-        with open(server_log_path, "w", encoding="utf-8") as log_fp:
-            # Run "python app.py" inside backend_dir
-            proc = subprocess.Popen([venv_python, app_path], cwd=backend_dir, stdout=log_fp, stderr=subprocess.STDOUT, text=True)
-        log(f"[INFO] Backend process started (PID={proc.pid}). Waiting for health...")
-        # Wait for the server to be healthy
-        health = wait_for_health(HEALTH_URL, expect_service_substr="Python Flask Backend", timeout_seconds=60)
-    else:
-        # Already running; still fetch health
-        health = wait_for_health(HEALTH_URL, expect_service_substr="Python Flask Backend", timeout_seconds=30)
+            yield
+        finally:
+            sem.release()
 
-    session_id = str(health.get("session_id"))
-    total_before = int(health.get("total_conversations", 0))
-    log(f"[INFO] Backend healthy. session_id={session_id}, total_conversations(before)={total_before}")
+def run_checked(cmd, deadline=None):
+    timeout = deadline.remaining() if deadline is not None else None
+    try:
+        subprocess.check_call(cmd, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise JobTimeout(f"Job timed out running: {' '.join(cmd[:3])} ...")
+
+def iter_submissions(source):
+    """Yield zip paths from a directory, a single zip, a queue file (one path per line) or '-' for stdin."""
+    if os.path.isdir(source):
+        for path in sorted(glob.glob(os.path.join(source, "*.zip"))):
+            yield os.path.abspath(path)
+        return
+    if source.lower().endswith(".zip"):
+        yield os.path.abspath(source)
+        return
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield os.path.abspath(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def write_json_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def run_job(job_id, zip_path, output_dir, stages, job_timeout, **run_options):
+    """Run one cohort submission and return its index record; run_options go to run_submission."""
+    _log_context.tag = job_id
+    started = time.monotonic()
+    record = {"job_id": job_id, "zip": zip_path, "status": "ok", "error": None}
+    try:
+        summary = run_submission(zip_path, extract_to=os.path.join(output_dir, job_id),
+                                 stages=stages, deadline=Deadline(job_timeout), **run_options)
+        record["results_path"] = summary["results_path"]
+        record["session_id"] = summary["session_id"]
+        for key in ("sessions", "turns", "turn_errors"):
+            record[key] = summary[key]
+        record["resources"] = {k: summary["resources"][k] for k in ("cpu_s", "peak_rss_bytes", "peak_open_fds", "output_bytes")}
+        if summary["performance"]:
+            perf = summary["performance"]
+            record["load"] = {"throughput_rps": perf["throughput_rps"], "p99_ms": perf["latency_ms"]["p99"],
+                              "error_rate": perf["error_rate"]}
+    except JobTimeout as e:
+        record.update(status="timeout", error=str(e))
+        log(f"[ERROR] {e}")
+    except Exception as e:
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+        log(f"[ERROR] Job failed: {e}")
+    finally:
+        _log_context.tag = None
+    record["duration_s"] = round(time.monotonic() - started, 3)
+    return record
+
+def run_cohort(source, output_dir, workers, job_timeout=DEFAULT_JOB_TIMEOUT, stage_limits=None, **run_options):
+    """Run every submission from source through a worker pool and write a consolidated results index.
+
+    run_options (suite_path, resume, pool, load_*) are passed to every run_submission; with a
+    BackendPool, jobs whose backend environment hashes the same share warm backends.
+    """
+    backend_pool = run_options.get("pool")
+    os.makedirs(output_dir, exist_ok=True)
+    stages = StageLimits(stage_limits)
+    index_path = os.path.join(output_dir, RESULTS_INDEX_FILENAME)
+    index = {
+        "source": os.path.abspath(source) if source != "-" else source,
+        "workers": workers,
+        "stage_limits": stages.limits,
+        "job_timeout_s": job_timeout,
+        "suite": run_options.get("suite_path"),
+        "load_concurrency": run_options.get("load_concurrency", 0),
+        "jobs": [],
+    }
+    started = time.monotonic()
+    seen = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for zip_path in iter_submissions(source):
+            stem = os.path.splitext(os.path.basename(zip_path))[0]
+            seen[stem] = seen.get(stem, 0) + 1
+            job_id = stem if seen[stem] == 1 else f"{stem}_{seen[stem]}"
+            futures.append(executor.submit(run_job, job_id, zip_path, output_dir, stages, job_timeout, **run_options))
+        log(f"[INFO] Scheduled {len(futures)} submission(s) on {workers} worker(s); stage limits={stages.limits}")
+        for future in as_completed(futures):
+            record = future.result()
+            index["jobs"].append(record)
+            log(f"[INFO] {record['job_id']}: {record['status']} in {record['duration_s']}s")
+            write_json_atomic(index_path, index)
+    index["jobs"].sort(key=lambda r: r["job_id"])
+    index["wall_time_s"] = round(time.monotonic() - started, 3)
+    for status in ("ok", "failed", "timeout"):
+        index[status] = sum(1 for r in index["jobs"] if r["status"] == status)
+    if backend_pool is not None:
+        index["warm_pool"] = dict(backend_pool.stats, size=backend_pool.size)
+    write_json_atomic(index_path, index)
+    trace_summary = summarize_traces(find_trace_files([output_dir]))
+    write_json_atomic(os.path.join(output_dir, TRACE_SUMMARY_FILENAME), trace_summary)
+    print("\n===== PHASE TIMINGS (all jobs) =====")
+    print(format_trace_table(trace_summary))
+    log(f"[INFO] Cohort finished in {index['wall_time_s']}s: ok={index['ok']}, failed={index['failed']}, "
+        f"timeout={index['timeout']}. Index: {index_path}")
+    return index
+
+# -------------------------
+# Main Orchestration
+# -------------------------
 
-    # 5) Send batched inputs in a single session
-    run_results = []
-    for idx, user_message in enumerate(BATCH_INPUTS, start=1):
-        payload = {"user_message": user_message}
+def resolve_project_root(extracted_root):
+    # If the zip extracts a single top-level folder, point at that folder
+    top_items = [os.path.join(extracted_root, name) for name in os.listdir(extracted_root)]
+    top_dirs = [p for p in top_items if os.path.isdir(p)]
+    if len(top_dirs) == 1 and not any(os.path.isfile(p) for p in top_items):
+        return top_dirs[0]
+    return extracted_root
+
+def stop_backend(proc, drainer):
+    log("[INFO] Terminating backend process...")
+    try:
+        proc.terminate()
         try:
-            resp = http_post_json(CHAT_URL, payload, timeout=10.0)
-            assistant_response = resp.get("assistant_response")
-            run_results.append({
-                "index": idx,
-                "user": user_message,
-                "assistant": assistant_response
-            })
-            log(f"[RUN {idx}] User: {user_message}")
-            log(f"[RUN {idx}] Assistant: {assistant_response}")
-        except urllib_error.HTTPError as he:
-            # Try to read error body
-            try:
-                err_body = he.read().decode("utf-8")
-            except Exception:
-                err_body = str(he)
-            log(f"[ERROR] HTTPError on run {idx}: {he} | Body: {err_body}")
-            run_results.append({"index": idx, "user": user_message, "error": f"HTTPError: {he}"})
-        except Exception as e:
-            log(f"[ERROR] Exception on run {idx}: {e}")
-            run_results.append({"index": idx, "user": user_message, "error": str(e)})
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    except Exception as e:
+        log(f"[WARN] Error while terminating backend: {e}")
+    finally:
+        # Tail the last lines of server log for debugging
+        drainer.join()
+        print_log_tail(drainer)
 
-    # Allow file system to flush
-    time.sleep(0.5)
+def send_turn(urls, index, item, session_id, deadline, tracer):
+    """POST one suite item to /chat and return its run record."""
+    user_message = item["prompt"]
+    record = {"session": item["session"], "session_id": session_id, "index": index, "id": item["id"], "user": user_message}
+    for key in ("expected", "tags", "metadata"):
+        if item[key]:
+            record[key] = item[key]
+    try:
+        with tracer.span("chat_turn", index=index, item_id=item["id"]):
+            resp = http_post_json(urls["chat"], {CHAT_REQUEST_FIELD: user_message}, timeout=deadline.remaining(10.0))
+        assistant_response = resp.get(CHAT_RESPONSE_FIELD)
+        record["assistant"] = assistant_response
+        log(f"[RUN {index}] User: {user_message}")
+        log(f"[RUN {index}] Assistant: {assistant_response}")
+    except urllib_error.HTTPError as he:
+        # Try to read error body
+        try:
+            err_body = he.read().decode("utf-8")
+        except Exception:
+            err_body = str(he)
+        log(f"[ERROR] HTTPError on run {index}: {he} | Body: {err_body}")
+        record["error"] = f"HTTPError: {he}"
+    except JobTimeout:
+        raise
+    except Exception as e:
+        log(f"[ERROR] Exception on run {index}: {e}")
+        record["error"] = str(e)
+    return record
 
-    # 6) Resolve output JSON path and extract results
+def collect_session_output(backend_dir, session_id, tracer, job_backend_dir=None):
+    """Wait for and load output/session_<id>.json; returns (path or None, conversation).
+
+    A warm backend keeps writing into the tree it was launched from, which belongs to an
+    earlier job; the file is then copied into job_backend_dir's output directory and
+    that copy's path is returned.
+    """
     # The backend writes to backend-python/output/session_{session_id}.json
-    output_dir = os.path.join(backend_dir, "output")
-    output_path = os.path.join(output_dir, f"session_{session_id}.json")
-    # Wait briefly for file to exist
-    t0 = time.time()
-    while not os.path.isfile(output_path) and time.time() - t0 < 10:
-        time.sleep(0.25)
-    if not os.path.isfile(output_path):
-        log(f"[WARN] Expected output JSON not found at: {output_path}. Proceeding without file extraction.")
-        session_conversation = {"session_id": session_id, "conversations": []}
-    else:
+    filename = SESSION_FILE_TEMPLATE.format(session_id=session_id)
+    output_path = os.path.join(backend_dir, OUTPUT_DIRNAME, filename)
+    with tracer.span("collect_output") as span:
+        # Wait briefly for file to exist
+        t0 = time.time()
+        while not os.path.isfile(output_path) and time.time() - t0 < 10:
+            time.sleep(0.25)
+        if not os.path.isfile(output_path):
+            log(f"[WARN] Expected output JSON not found at: {output_path}. Proceeding without file extraction.")
+            return None, {"session_id": session_id, "conversations": []}
+        span["bytes_received"] = os.path.getsize(output_path)
         with open(output_path, "r", encoding="utf-8") as f:
-            session_conversation = json.load(f)
+            conversation = json.load(f)
         log(f"[INFO] Loaded session conversation from: {output_path}")
+        if job_backend_dir and os.path.abspath(job_backend_dir) != os.path.abspath(backend_dir):
+            job_output_dir = os.path.join(job_backend_dir, OUTPUT_DIRNAME)
+            os.makedirs(job_output_dir, exist_ok=True)
+            output_path = shutil.copy2(output_path, os.path.join(job_output_dir, filename))
+            log(f"[INFO] Copied session output into this job's tree: {output_path}")
+        return output_path, conversation
 
-    # 7) Display and save consolidated results
-    # Always extract reasoning steps before conclusion data when extracting from output files.
-    # (Note: This backend stores only 'user' and 'assistant' turns; no separate reasoning fields are present.)
-    print("\n===== SESSION SUMMARY =====")
+def start_new_session(urls, previous_session_id, previous_started_at=None, timeout=SESSION_RESET_TIMEOUT):
+    """Reset the backend and return the health of a session whose id differs from previous_session_id.
+
+    A backend that names sessions after the current second hands out the same id when
+    reset within that second, and both sessions would then write one output file. The
+    reset waits until the previous session (first seen at previous_started_at, a
+    time.time() value) is SESSION_ID_MIN_AGE old, is repeated while the id does not
+    change, and fails the run if it never does.
+    """
+    if previous_started_at is not None:
+        time.sleep(max(0.0, previous_started_at + SESSION_ID_MIN_AGE - time.time()))
+    give_up_at = time.time() + timeout
+    while True:
+        reset = http_post_json(urls["reset"], {}, timeout=10.0)
+        health = http_get_json(urls["health"], timeout=5.0)
+        session_id = health.get("session_id") or reset.get("new_session_id")
+        if session_id is not None and str(session_id) != str(previous_session_id):
+            health["session_id"] = session_id
+            log(f"[INFO] Started new backend session: {session_id}")
+            return health
+        if time.time() >= give_up_at:
+            raise RuntimeError(f"Backend kept session id {previous_session_id} after {RESET_ROUTE}; "
+                               f"suite sessions would share one output file")
+        time.sleep(SESSION_RESET_RETRY_INTERVAL)
+
+def run_session(backend, position, name, indexed_items, health, deadline, tracer, results, job_backend_dir=None):
+    session_id = str(health.get("session_id"))
+    log(f"[INFO] Running suite session '{name}' as backend session {session_id}")
+    turns_before, errors_before = results.turns, results.turn_errors
+    for index, item in indexed_items:
+        backend.monitor.check()
+        results.write("turn", send_turn(backend.urls, index, item, session_id, deadline, tracer))
+    # Allow file system to flush
+    time.sleep(0.5)
+    output_path, conversation = collect_session_output(backend.backend_dir, session_id, tracer, job_backend_dir)
+    session = {
+        "name": name,
+        "position": position,
+        "session_id": session_id,
+        "health_before": health,
+        "output_file": output_path,
+        "turns": results.turns - turns_before,
+        "turn_errors": results.turn_errors - errors_before,
+        "conversations": len(conversation.get("conversations", [])),
+        # Kept here because the backend may rewrite its file later (a repeated /reset, the load stage)
+        "transcript": conversation.get("conversations", []),
+    }
+    results.write("session", session)
+    return session
+
+def run_submission(zip_path, extract_to=None, stages=None, deadline=None, suite_path=None, resume=False, pool=None,
+                   load_concurrency=0, load_duration=DEFAULT_LOAD_DURATION, resource_limits=None, profile_startup=False):
+    """Unzip, install and run one submission; returns the automation summary.
+
+    Phase and per-request timings go to automation_trace.jsonl next to the results.
+    With resume=True an earlier checkpointed run of the same zip is continued:
+    its extraction and venv are reused and completed suite sessions are skipped.
+    With a BackendPool, a warm backend of the same environment replaces install and launch.
+    load_concurrency > 0 adds a load stage of load_duration seconds after the suite.
+    resource_limits are ResourceMonitor ceilings; crossing one kills the backend and fails the run.
+    profile_startup launches the backend under -X importtime and stores the report in startup["profile"].
+    """
+    tracer = Tracer(run_id=os.path.splitext(os.path.basename(zip_path))[0])
     try:
-        health_after = http_get_json(HEALTH_URL, timeout=5.0)
-    except Exception:
-        health_after = {}
-    total_after = int(health_after.get("total_conversations", len(session_conversation.get("conversations", []))))
-    print(f"Session ID: {session_id}")
-    print(f"Total conversations logged: before={total_before}, after={total_after}")
-    print("")
-    print("Conversation transcript (order preserved):")
-    conversations = session_conversation.get("conversations", [])
-    for i, turn in enumerate(conversations, start=1):
-        u = turn.get("user")
-        a = turn.get("assistant")
-        print(f"  Turn {i} - User     : {u}")
-        print(f"  Turn {i} - Assistant: {a}")
-
-    # Save automation results for convenience
+        with tracer.span("submission"):
+            return execute_submission(zip_path, extract_to, stages, deadline, tracer, suite_path, resume, pool,
+                                      load_concurrency, load_duration, resource_limits, profile_startup)
+    finally:
+        tracer.close()
+
+def execute_submission(zip_path, extract_to, stages, deadline, tracer, suite_path=None, resume=False, pool=None,
+                       load_concurrency=0, load_duration=DEFAULT_LOAD_DURATION, resource_limits=None,
+                       profile_startup=False):
+    if stages is None:
+        stages = StageLimits()
+    if deadline is None:
+        deadline = Deadline()
+
+    # 1) Unzip the project and resolve its root (handle nested single folder case)
+    with stages.stage("prepare", deadline):
+        log(f"[INFO] Using project zip: {zip_path}")
+        project_root, checkpoint = find_resumable_root(zip_path, extract_to) if resume else (None, None)
+        if checkpoint:
+            log(f"[INFO] Resuming from checkpoint in: {project_root}")
+        else:
+            if resume:
+                log("[INFO] No usable checkpoint found; starting a fresh run")
+            with tracer.span("unzip") as span:
+                extracted_root = unzip_project(zip_path, extract_to)
+                span["bytes_received"] = os.path.getsize(zip_path)
+            project_root = resolve_project_root(extracted_root)
+            checkpoint = {"zip": zip_path, "zip_sha256": file_sha256(zip_path), "env": {}}
+        log(f"[INFO] Project root resolved to: {project_root}")
+        tracer.open(os.path.join(project_root, TRACE_FILENAME))
+
+        # Completed items only carry over when the suite is unchanged
+        suite_sha = file_sha256(suite_path) if suite_path else None
+        resume_items = resume and checkpoint.get("suite_sha256") == suite_sha
+        if resume and not resume_items:
+            log("[WARN] Suite changed since the checkpoint; re-running every item")
+        checkpoint.update(suite=suite_path, suite_sha256=suite_sha, complete=False)
+        checkpoint_path = os.path.join(project_root, CHECKPOINT_FILENAME)
+        write_json_atomic(checkpoint_path, checkpoint)
+
+        # 2) Detect backend entry and dependencies (one pruned scan per extraction)
+        with tracer.span("scan"):
+            manifest = get_project_manifest(project_root, refresh=True)
+            backend_dir = locate_backend_dir(project_root, manifest)
+        app_path = os.path.join(backend_dir, BACKEND_APP_FILENAME)
+        requirements_path = os.path.join(backend_dir, REQUIREMENTS_FILENAME)
+        if not os.path.isfile(app_path):
+            raise FileNotFoundError(f"Could not find backend app at: {app_path}")
+        if not os.path.isfile(requirements_path):
+            log(f"[WARN] Missing requirements.txt at: {requirements_path} (will try running without installing dependencies)")
+
+    # 3) Create and prepare the venv, unless a warm backend of this environment is idle in the pool
+    env_key = backend_env_key(backend_dir) if pool is not None else None
+    venv_dir = os.path.join(backend_dir, VENV_DIRNAME)
+    venv_python = venv_python_path(venv_dir)
+    if pool is not None and pool.has_idle(env_key):
+        log("[INFO] Warm backend available for this environment; skipping venv setup")
+    elif resume and env_is_reusable(checkpoint, venv_dir, requirements_path):
+        log(f"[INFO] Reusing checkpointed venv: {venv_dir}")
+    else:
+        with stages.stage("install", deadline):
+            install_environment(venv_dir, requirements_path, project_root, checkpoint, checkpoint_path, deadline, tracer)
+
+    with stages.stage("run", deadline):
+        # 4) Take the warm backend or launch one (Flask app.py) on a port of its own. Once the run
+        # slot is held, the backend is always returned to the pool or stopped, whatever fails.
+        backend = results = None
+        finished = False
+        try:
+            if pool is not None:
+                with tracer.span("pool_acquire"):
+                    backend, health = pool.acquire(env_key)
+            if backend is None:
+                if not os.path.isfile(venv_python):
+                    # The idle backend went to another job, or died, after the check above
+                    install_environment(venv_dir, requirements_path, project_root, checkpoint, checkpoint_path,
+                                        deadline, tracer)
+                server_log_path = os.path.join(backend_dir, "server.log")
+                log(f"[INFO] Launching backend: {app_path}")
+                with tracer.span("backend_startup"):
+                    proc, drainer, urls, health, startup = launch_backend(venv_python, app_path, backend_dir,
+                                                                         server_log_path,
+                                                                         timeout_seconds=deadline.remaining(60),
+                                                                         profile_imports=profile_startup)
+                backend = LaunchedBackend(proc, drainer, urls, backend_dir, env_key, resource_limits)
+            else:
+                urls = backend.urls
+                startup = {"warm": True, "port": urllib_parse.urlsplit(urls["base"]).port,
+                           "jobs_served": backend.jobs, "backend_dir": backend.backend_dir}
+                backend.monitor.begin_job()
+            stream_path = os.path.join(project_root, RESULTS_STREAM_FILENAME)
+            results = ResultsWriter(stream_path, resume=resume_items)
+            if results.completed:
+                log(f"[INFO] Skipping {len(results.completed)} sessions completed before the checkpoint")
+            log(f"[INFO] Backend healthy. session_id={health.get('session_id')}, "
+                f"total_conversations(before)={health.get('total_conversations', 0)}")
+
+            # 5) Send the suite, one backend session per suite session; every turn is streamed to disk
+            items = iter_suite(suite_path) if suite_path else iter_builtin_suite()
+            first_session_id = None
+            started_sessions = 0
+            session_started_at = time.time()
+            for position, (name, session_items) in enumerate(iter_sessions(items)):
+                if position in results.completed:
+                    continue
+                if started_sessions:
+                    health = start_new_session(urls, health.get("session_id"), session_started_at)
+                # No earlier than the session id was created, which is all start_new_session needs
+                session_started_at = time.time()
+                started_sessions += 1
+                session = run_session(backend, position, name, enumerate(session_items, start=1), health, deadline,
+                                      tracer, results, backend_dir)
+                first_session_id = first_session_id or session["session_id"]
+
+            try:
+                health_after = http_get_json(urls["health"], timeout=5.0)
+            except Exception:
+                health_after = {}
+
+            # Optional load stage, after the functional run and in a backend session of its own,
+            # so its traffic is not appended to the last suite session's transcript
+            performance = None
+            if load_concurrency:
+                with tracer.span("load", concurrency=load_concurrency):
+                    load_health = start_new_session(urls, health_after.get("session_id", health.get("session_id")),
+                                                    session_started_at)
+                    performance = run_load(backend, load_concurrency, deadline.remaining(load_duration),
+                                           prompts=load_prompts(suite_path))
+                performance["session_id"] = str(load_health.get("session_id"))
+                results.write("performance", performance)
+
+            resources = backend.monitor.report()
+            results.write("resources", resources)
+            backend.monitor.check()
+            finished = True
+        except BaseException:
+            # Everything streamed so far stays on disk as partial results
+            if results is not None:
+                results.close()
+            raise
+        finally:
+            # 6) Shutdown the backend we started, or hand it back to the pool
+            HTTP_CLIENT.close()
+            if backend is not None:
+                with tracer.span("shutdown"):
+                    if pool is None:
+                        backend.stop()
+                    else:
+                        pool.release(backend, reusable=finished)
+
+    # 7) Close the results stream with a summary record and write the summary header
     automation_summary = {
-        "session_id": session_id,
+        "session_id": first_session_id,
         "backend_dir": backend_dir,
-        "output_file": output_path if os.path.isfile(output_path) else None,
-        "health_before": health,
+        "suite": suite_path,
+        "results_file": stream_path,
+        **results.totals(),
         "health_after": health_after,
-        "batched_runs": run_results,
-        "session_conversation": session_conversation,
+        "startup": startup,
+        "performance": performance,
+        "resources": resources,
+        "phase_timings": tracer.phase_timings(),
+        "trace_file": tracer.path,
     }
-    results_path = os.path.join(project_root, "automation_results.json")
+    results.write("summary", automation_summary)
+    results.close()
+    checkpoint["complete"] = True
+    write_json_atomic(checkpoint_path, checkpoint)
+    results_path = os.path.join(project_root, RESULTS_FILENAME)
     with open(results_path, "w", encoding="utf-8") as f:
         json.dump(automation_summary, f, indent=2, ensure_ascii=False)
-    print(f"\n[INFO] Wrote automation summary to: {results_path}")
+    log(f"[INFO] Wrote {automation_summary['turns']} turn results to: {stream_path}")
+    log(f"[INFO] Wrote automation summary to: {results_path}")
+    automation_summary["results_path"] = results_path
+    return automation_summary
 
-    # 8) Shutdown the backend we started (if we started it)
-    if proc is not None:
-        log("[INFO] Terminating backend process...")
+def print_session_summary(summary):
+    # Always extract reasoning steps before conclusion data when extracting from output files.
+    # (Note: This backend stores only 'user' and 'assistant' turns; no separate reasoning fields are present.)
+    for session in iter_results(summary["results_file"], "session"):
+        conversations = session.get("transcript")
+        if conversations is None:
+            # Session records written before transcripts were kept in the stream
+            conversations = []
+            if session["output_file"]:
+                with open(session["output_file"], "r", encoding="utf-8") as f:
+                    conversations = json.load(f).get("conversations", [])
+        total_before = int(session["health_before"].get("total_conversations", 0))
+        print(f"\n===== SESSION SUMMARY ({session['name']}) =====")
+        print(f"Session ID: {session['session_id']}")
+        print(f"Total conversations logged: before={total_before}, after={len(conversations)}")
+        print("")
+        print("Conversation transcript (order preserved):")
+        for i, turn in enumerate(conversations, start=1):
+            u = turn.get("user")
+            a = turn.get("assistant")
+            print(f"  Turn {i} - User     : {u}")
+            print(f"  Turn {i} - Assistant: {a}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Unzip, set up, run and exercise GenAI project submissions.")
+    parser.add_argument("zip", nargs="?", help="Project zip to run (default: first zip next to this script)")
+    parser.add_argument("--suite", metavar="PATH",
+                        help="Input suite (.jsonl or .csv) streamed item by item; defaults to the built-in BATCH_INPUTS")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"Continue from {CHECKPOINT_FILENAME}: reuse the extraction and venv, skip completed sessions")
+    parser.add_argument("--cohort", metavar="SOURCE",
+                        help="Run many submissions: a directory of zips, a queue file with one zip path per line, or '-' for stdin")
+    parser.add_argument("--output-dir", help="Where cohort jobs are extracted and the results index is written (default: <SOURCE dir>/_runs)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_STAGE_LIMITS["install"], help="Jobs in flight at once")
+    parser.add_argument("--job-timeout", type=float, default=DEFAULT_JOB_TIMEOUT, help="Per-job time budget in seconds")
+    parser.add_argument("--prepare-limit", type=int, help="Concurrent unzip/scan stages")
+    parser.add_argument("--install-limit", type=int, help="Concurrent venv/pip stages")
+    parser.add_argument("--run-limit", type=int, help="Concurrent backend runs")
+    parser.add_argument("--warm-pool", type=int, default=0, metavar="N",
+                        help="Cohort mode: keep up to N idle backends alive per environment hash and reuse them via /reset")
+    parser.add_argument("--pool-max-jobs", type=int, default=DEFAULT_POOL_MAX_JOBS,
+                        help="Recycle a pooled backend after this many jobs")
+    parser.add_argument("--pool-max-rss-growth-mb", type=int, default=DEFAULT_POOL_MAX_RSS_GROWTH // (1024 * 1024),
+                        help="Recycle a pooled backend once its RSS grew this many MiB since launch")
+    parser.add_argument("--load-concurrency", type=int, default=0, metavar="K",
+                        help="After the suite, drive the backend with K concurrent clients and record a performance section")
+    parser.add_argument("--load-duration", type=float, default=DEFAULT_LOAD_DURATION, metavar="SECONDS",
+                        help="Length of the load stage")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Launch backends under -X importtime and record time-to-listen and the heaviest imports")
+    parser.add_argument("--max-cpu-seconds", type=float, help="Kill a backend whose process tree used more CPU than this")
+    parser.add_argument("--max-rss-mb", type=int, help="Kill a backend whose process tree RSS exceeds this")
+    parser.add_argument("--max-open-fds", type=int, help="Kill a backend whose process tree holds more open files than this")
+    parser.add_argument("--max-output-mb", type=int, help="Kill a backend that wrote more than this into output/")
+    parser.add_argument("--trace-summary", nargs="+", metavar="PATH",
+                        help=f"Aggregate {TRACE_FILENAME} files (or directories containing them) into a phase timing table and exit")
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    if args.trace_summary:
+        print(format_trace_table(summarize_traces(find_trace_files(args.trace_summary))))
+        return
+
+    run_options = {
+        "suite_path": os.path.abspath(args.suite) if args.suite else None,
+        "resume": args.resume,
+        "load_concurrency": args.load_concurrency,
+        "load_duration": args.load_duration,
+        "profile_startup": args.profile_startup,
+        "resource_limits": {
+            "cpu_s": args.max_cpu_seconds,
+            "rss_bytes": args.max_rss_mb * 1024 * 1024 if args.max_rss_mb else None,
+            "open_fds": args.max_open_fds,
+            "output_bytes": args.max_output_mb * 1024 * 1024 if args.max_output_mb else None,
+        },
+    }
+    if args.cohort:
+        source_dir = args.cohort if os.path.isdir(args.cohort) else os.path.dirname(os.path.abspath(args.cohort))
+        if args.cohort == "-":
+            source_dir = os.getcwd()
+        output_dir = os.path.abspath(args.output_dir or os.path.join(source_dir, "_runs"))
+        stage_limits = {name: value for name, value in (
+            ("prepare", args.prepare_limit), ("install", args.install_limit), ("run", args.run_limit)) if value}
+        backend_pool = None
+        if args.warm_pool:
+            backend_pool = BackendPool(args.warm_pool, args.pool_max_jobs, args.pool_max_rss_growth_mb * 1024 * 1024)
         try:
-            proc.terminate()
-            try:
-                proc.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                proc.kill()
-        except Exception as e:
-            log(f"[WARN] Error while terminating backend: {e}")
+            index = run_cohort(args.cohort, output_dir, args.workers, args.job_timeout, stage_limits,
+                               pool=backend_pool, **run_options)
         finally:
-            # Tail the last lines of server log for debugging
-            if os.path.isfile(server_log_path):
-                print("\n===== SERVER LOG (tail) =====")
-                try:
-                    with open(server_log_path, "r", encoding="utf-8") as f:
-                        lines = f.readlines()[-50:]
-                    for line in lines:
-                        print(line.rstrip())
-                except Exception:
-                    pass
+            if backend_pool is not None:
+                backend_pool.close()
+        print("\n[DONE] Cohort complete.")
+        if index["failed"] or index["timeout"]:
+            sys.exit(1)
+        return
 
+    # Locate the project zip and run it
+    zip_path = find_first_zip(".", args.zip or PROJECT_ZIP)
+    if not zip_path:
+        raise FileNotFoundError("No .zip file found in current directory. Place the project zip next to this script or pass its path as an argument.")
+    summary = run_submission(zip_path, **run_options)
+    print_session_summary(summary)
+    if summary["performance"]:
+        print("\n===== LOAD =====")
+        print(json.dumps(summary["performance"], indent=2))
+    print("\n===== PHASE TIMINGS =====")
+    print(format_trace_table(summarize_traces([summary["trace_file"]])))
     print("\n[DONE] Automation complete.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,7 +5,7 @@ This script:
 - Creates a Python virtual environment in the project backend directory.
 - Installs required packages from backend-python/requirements.txt.
 - Launches the Flask backend (app.py).
-- Sends a batch of 20 input questions to /chat within a single session.
+- Sends a batch of 20 input questions to /chat within a single session (or streams a JSONL/CSV suite named by INPUT_SUITE).
 - After each input, it reads and extracts the full session conversation from the designated output file.
 - Prints a reasoning summary before the full conversation (as requested).
 
@@ -30,9 +30,14 @@ import sys
 import subprocess
 import time
 import json
-import urllib.request
 import urllib.error
+import urllib.parse
+import http.client
+import io
 import socket
+import threading
+import collections
+import csv
 
 # --------------- Configuration and Batched Inputs -----------------
 
@@ -57,12 +62,76 @@ BATCHED_INPUTS_TEXT = """1. What is the effective date of the Pro Referral Netwo
 19. What's the salary range for a Python developer at Bitwise?
 20. How long does the referral ownership last?"""
 
+# Set INPUT_SUITE to a .jsonl or .csv file to stream prompts from it instead of
+# BATCHED_INPUTS_TEXT. Rows carry a prompt plus optional session/id/expected/tags.
+INPUT_SUITE_ENV = "INPUT_SUITE"
+DEFAULT_SESSION_NAME = "default"
+SUITE_PROMPT_FIELDS = ("prompt", "user_message", "input", "question")
+SUITE_RESERVED_FIELDS = {"session", "id", "expected", "tags"} | set(SUITE_PROMPT_FIELDS)
+
 # Endpoint configuration
 DEFAULT_HOST = "127.0.0.1"
-DEFAULT_PORT = 5001
 CHAT_ENDPOINT = "/chat"
 HEALTH_ENDPOINT = "/health"
-RESET_ENDPOINT = "/reset"  # not used, but available
+RESET_ENDPOINT = "/reset"  # used to start a fresh session between suite sessions
+
+# The backend gets a free port allocated per run, exported under these names
+# and forced onto Flask's app.run() by LAUNCH_SHIM for apps that hard-code one.
+PORT_ENV_VARS = ("PORT", "FLASK_RUN_PORT", "RUNNER_PORT")
+LAUNCH_SHIM = """
+import os, runpy, sys
+host = os.environ.get("RUNNER_HOST", "127.0.0.1")
+port = int(os.environ["RUNNER_PORT"])
+try:
+    import flask
+except ImportError:
+    flask = None
+if flask is not None:
+    _run = flask.Flask.run
+    def run(self, *args, **kwargs):
+        kwargs.pop("host", None)
+        kwargs.pop("port", None)
+        kwargs["use_reloader"] = False
+        return _run(self, host, port, *args[2:], **kwargs)
+    flask.Flask.run = run
+app_path = os.path.abspath(sys.argv[1])
+sys.argv = [app_path] + sys.argv[2:]
+sys.path.insert(0, os.path.dirname(app_path))
+runpy.run_path(app_path, run_name="__main__")
+"""
+
+# Readiness detection: log lines that mean the server has bound its socket,
+# the fast polling tick, and the exponential backoff used for HTTP probes.
+BIND_MESSAGE_PATTERNS = ("Running on http", "Uvicorn running on", "Listening on", "Serving on")
+READY_POLL_INTERVAL = 0.05
+PROBE_BACKOFF_INITIAL = 0.05
+PROBE_BACKOFF_MAX = 1.0
+
+# Backend output lines kept in memory for diagnostics
+LOG_RING_LINES = 200
+
+# Project scanning: directory names that never hold submission sources.
+# Bundled virtualenvs are also detected by their pyvenv.cfg marker.
+DEFAULT_PRUNE_DIRS = {
+    ".git", ".hg", ".svn", ".idea", ".vscode",
+    "__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    "venv", ".venv", "site-packages", "dist-packages",
+    "node_modules", "bower_components", ".next", ".gradle",
+}
+# Usually build artefacts, but also plausible names for a project's own packages:
+# pruned only when no entry point lives anywhere below them.
+BUILD_OUTPUT_DIRS = {"build", "dist", "target"}
+ENTRY_POINT_FILENAMES = {"app.py", "main.py", "server.py", "run.py", "wsgi.py", "manage.py", "cli.py"}
+DEPENDENCY_FILENAMES = {"requirements.txt", "pyproject.toml", "setup.py", "Pipfile", "package.json", "pom.xml", "build.gradle"}
+OUTPUT_DIR_NAMES = {"output", "outputs"}
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".java": "java",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
 
 # --------------- Utility Functions -----------------
 
@@ -72,36 +141,233 @@ def is_windows():
 def norm(p):
     return os.path.normpath(p)
 
+# Errors that mean a kept-alive connection was closed under us.
+CONNECTION_RESET_ERRORS = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError, http.client.RemoteDisconnected)
+
+class KeepAliveClient:
+    """
+    Pooled HTTP/1.1 client holding one persistent connection per host:port per thread.
+    Requests on a reused connection that turns out to be stale are retried on a
+    fresh one; GETs are also retried when a fresh connection is reset.
+    """
+
+    def __init__(self, max_retries=1):
+        self.max_retries = max_retries
+        self._local = threading.local()
+
+    def _pool(self):
+        pool = getattr(self._local, "connections", None)
+        if pool is None:
+            pool = self._local.connections = {}
+        return pool
+
+    def _drop(self, key):
+        conn = self._pool().pop(key, None)
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, url, body=None, headers=None, timeout=10.0):
+        """Send a request and return (status, reason, headers, body_bytes)."""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.hostname, parts.port or 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        attempt = 0
+        while True:
+            pool = self._pool()
+            conn = pool.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = pool[key] = http.client.HTTPConnection(key[0], key[1], timeout=timeout)
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except CONNECTION_RESET_ERRORS:
+                self._drop(key)
+                if attempt >= self.max_retries or not (reused or method == "GET"):
+                    raise
+                attempt += 1
+                continue
+            except Exception:
+                self._drop(key)
+                raise
+            if resp.will_close:
+                self._drop(key)
+            return resp.status, resp.reason, resp.headers, data
+
+    def request_json(self, method, url, payload=None, timeout=10.0):
+        headers = {"Accept": "application/json"}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        status, reason, resp_headers, data = self.request(method, url, body=body, headers=headers, timeout=timeout)
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, resp_headers, io.BytesIO(data))
+        charset = resp_headers.get_content_charset() or "utf-8"
+        return json.loads(data.decode(charset, errors="replace"))
+
+    def close(self):
+        pool = self._pool()
+        for key in list(pool):
+            self._drop(key)
+
+HTTP_CLIENT = KeepAliveClient()
+
 def http_get_json(url, timeout=3.0):
-    req = urllib.request.Request(url, method="GET")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        charset = resp.headers.get_content_charset() or "utf-8"
-        data = resp.read().decode(charset, errors="replace")
-        return json.loads(data)
+    return HTTP_CLIENT.request_json("GET", url, timeout=timeout)
 
 def http_post_json(url, payload, timeout=5.0):
-    data = json.dumps(payload).encode("utf-8")
-    headers = {"Content-Type": "application/json"}
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        charset = resp.headers.get_content_charset() or "utf-8"
-        body = resp.read().decode(charset, errors="replace")
-        return json.loads(body)
-
-def wait_for_health(base_url, timeout=60.0, interval=1.0):
-    start = time.time()
+    return HTTP_CLIENT.request_json("POST", url, payload, timeout=timeout)
+
+def reset_session(base_url, previous_session_id, previous_started_at, timeout=5.0):
+    """
+    POST /reset until /health reports a session id other than previous_session_id.
+    The sample backend names sessions after the current second, so a reset within
+    that second reuses the id and the new session would overwrite the old file;
+    the first reset therefore waits until the previous session is a second old.
+    """
+    time.sleep(max(0.0, previous_started_at + 1.0 - time.time()))
+    give_up_at = time.time() + timeout
+    while True:
+        reset = http_post_json(base_url + RESET_ENDPOINT, {}, timeout=10.0)
+        health = http_get_json(base_url + HEALTH_ENDPOINT, timeout=3.0)
+        session_id = health.get("session_id") or reset.get("new_session_id")
+        if session_id is not None and str(session_id) != str(previous_session_id):
+            return str(session_id)
+        if time.time() >= give_up_at:
+            raise RuntimeError(f"Backend kept session id {previous_session_id} after {RESET_ENDPOINT}")
+        time.sleep(0.25)
+
+class BackendExitedError(RuntimeError):
+    pass
+
+def check_backend_alive(proc):
+    if proc is not None and proc.poll() is not None:
+        raise BackendExitedError(f"Backend process exited with code {proc.returncode} before becoming ready")
+
+def port_is_open(host, port, timeout=0.5):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        try:
+            s.connect((host, port))
+            return True
+        except OSError:
+            return False
+
+def wait_for_health(base_url, timeout=60.0, proc=None):
+    """
+    Probe the health endpoint with exponential backoff. Raises BackendExitedError
+    as soon as proc exits instead of waiting out the timeout.
+    """
+    start = time.monotonic()
+    delay = PROBE_BACKOFF_INITIAL
     last_err = None
-    while time.time() - start < timeout:
+    while time.monotonic() - start < timeout:
+        check_backend_alive(proc)
         try:
-            health = http_get_json(base_url + HEALTH_ENDPOINT, timeout=interval)
+            health = http_get_json(base_url + HEALTH_ENDPOINT, timeout=2.0)
             return health
-        except (urllib.error.URLError, urllib.error.HTTPError, socket.timeout) as e:
+        except (urllib.error.URLError, http.client.HTTPException, socket.timeout, ConnectionError) as e:
             last_err = e
-            time.sleep(interval)
+            time.sleep(delay)
+            delay = min(delay * 2, PROBE_BACKOFF_MAX)
     raise RuntimeError(f"Backend health check failed after {timeout}s. Last error: {last_err}")
 
+class LogDrainer:
+    """
+    Drains a child's merged stdout/stderr on a background thread so the child
+    never blocks on a full pipe. The last max_lines lines stay in a ring buffer
+    and, if spool_path is given, every line is also written there. bind_event
+    is set once a line matches BIND_MESSAGE_PATTERNS.
+    """
+
+    def __init__(self, stream, max_lines=LOG_RING_LINES, spool_path=None):
+        self.stream = stream
+        self.spool_path = spool_path
+        self.lines = collections.deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.bind_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-drainer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        spool = open(self.spool_path, "w", encoding="utf-8") if self.spool_path else None
+        try:
+            for line in self.stream:
+                line = line.rstrip("\n")
+                self.lines.append(line)
+                self.total_lines += 1
+                if spool is not None:
+                    spool.write(line + "\n")
+                    spool.flush()
+                if not self.bind_event.is_set() and any(p in line for p in BIND_MESSAGE_PATTERNS):
+                    self.bind_event.set()
+        except ValueError:
+            pass  # stream closed under us during shutdown
+        finally:
+            if spool is not None:
+                spool.close()
+
+    def tail(self, n=50):
+        # Beyond the ring buffer, read the spool backwards from its end
+        if n > len(self.lines) and self.total_lines > len(self.lines) and self.spool_path:
+            return tail_file(self.spool_path, n)
+        return list(self.lines)[-n:]
+
+    def contains(self, text):
+        return any(text in line for line in self.lines)
+
+    def join(self, timeout=5.0):
+        self._thread.join(timeout)
+
+def tail_file(path, n=50, block_size=8192):
+    # Return the last n lines of a file, reading backwards from the end in blocks
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= n:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines()[-n:]]
+
+def wait_for_ready(proc, drainer, host, port, timeout=60.0):
+    """
+    Wait for the bind message or an accepting socket, failing fast if the
+    process exits, then confirm with /health. Returns (health, startup) where
+    startup holds latencies in seconds from the call.
+    """
+    start = time.monotonic()
+    startup = {"bind_message_s": None, "socket_open_s": None, "healthy_s": None}
+    while True:
+        check_backend_alive(proc)
+        if startup["bind_message_s"] is None and drainer.bind_event.wait(READY_POLL_INTERVAL):
+            startup["bind_message_s"] = round(time.monotonic() - start, 3)
+        if port_is_open(host, port, timeout=READY_POLL_INTERVAL):
+            startup["socket_open_s"] = round(time.monotonic() - start, 3)
+            break
+        if time.monotonic() - start > timeout:
+            raise RuntimeError(f"Backend did not open {host}:{port} within {timeout}s")
+    remaining = max(timeout - (time.monotonic() - start), 1.0)
+    health = wait_for_health(f"http://{host}:{port}", timeout=remaining, proc=proc)
+    startup["healthy_s"] = round(time.monotonic() - start, 3)
+    return health, startup
+
 def parse_batched_inputs(text_block):
-    inputs = []
+    """
+    Yield the numbered questions of a text block one at a time, without the enumeration.
+    """
     for line in text_block.splitlines():
         line = line.strip()
         if not line:
@@ -112,8 +378,53 @@ def parse_batched_inputs(text_block):
             # only drop the leading number if it looks like a number
             if parts[0].isdigit():
                 line = parts[1]
-        inputs.append(line)
-    return inputs
+        yield line
+
+def suite_item(raw, line_no):
+    prompt = next((raw[f] for f in SUITE_PROMPT_FIELDS if raw.get(f)), None)
+    if prompt is None:
+        raise ValueError(f"Suite item on line {line_no} has no prompt (expected one of {SUITE_PROMPT_FIELDS})")
+    session = str(raw.get("session") or DEFAULT_SESSION_NAME)
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(";") if t.strip()]
+    return {
+        "session": session,
+        "id": str(raw.get("id") or f"{session}-{line_no}"),
+        "prompt": prompt,
+        "expected": raw.get("expected") or None,
+        "tags": tags,
+        "metadata": {k: v for k, v in raw.items() if k not in SUITE_RESERVED_FIELDS and v not in (None, "")},
+    }
+
+def iter_suite(path):
+    """
+    Lazily yield suite items from a .jsonl or .csv file (CSV needs a header row).
+    Each item is {session, id, prompt, expected, tags, metadata}; unknown columns become metadata.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield suite_item(row, line_no)
+        elif ext in (".jsonl", ".ndjson"):
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield suite_item(json.loads(line), line_no)
+        else:
+            raise ValueError(f"Unsupported suite format: {path} (use .jsonl or .csv)")
+
+def iter_inputs():
+    """
+    Yield suite items from $INPUT_SUITE when set, else from BATCHED_INPUTS_TEXT as a single session.
+    """
+    suite_path = os.environ.get(INPUT_SUITE_ENV)
+    if suite_path:
+        yield from iter_suite(suite_path)
+        return
+    for idx, question in enumerate(parse_batched_inputs(BATCHED_INPUTS_TEXT), start=1):
+        yield {"session": DEFAULT_SESSION_NAME, "id": str(idx), "prompt": question,
+               "expected": None, "tags": [], "metadata": {}}
 
 def create_venv(venv_path):
     # Create virtual environment
@@ -137,15 +448,25 @@ def install_requirements(pip_exe, requirements_path):
     subprocess.check_call([pip_exe, "install", "-r", requirements_path])
     print("[Setup] Dependencies installed.")
 
-def launch_flask_app(python_exe, app_path, workdir):
-    print(f"[Run] Launching Flask backend: {app_path}")
-    # Start the Flask app in a subprocess
+def allocate_port(host=DEFAULT_HOST):
+    # Ask the OS for a free TCP port so several runners can share one host
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+def launch_flask_app(python_exe, app_path, workdir, port, host=DEFAULT_HOST):
+    print(f"[Run] Launching Flask backend: {app_path} on port {port}")
+    env = dict(os.environ, PYTHONUNBUFFERED="1", RUNNER_HOST=host)
+    for name in PORT_ENV_VARS:
+        env[name] = str(port)
+    # Start the Flask app in a subprocess through the port-injecting shim
     proc = subprocess.Popen(
-        [python_exe, app_path],
+        [python_exe, "-c", LAUNCH_SHIM, app_path],
         cwd=workdir,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True
+        text=True,
+        env=env
     )
     return proc
 
@@ -161,13 +482,97 @@ def safe_terminate(proc):
         except Exception as e:
             print(f"[Run] Error terminating process: {e}")
 
-def detect_backend_dir(project_root):
+def is_pruned_dir(entry, prune_dirs):
+    if entry.name in prune_dirs or entry.name.startswith(".venv"):
+        return True
+    if os.path.isfile(os.path.join(entry.path, "pyvenv.cfg")):
+        return True
+    return entry.name in BUILD_OUTPUT_DIRS and not contains_entry_point(entry.path, prune_dirs)
+
+def contains_entry_point(path, prune_dirs):
+    """Whether a known entry point file lies anywhere below path, outside pruned trees; stops at the first."""
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_pruned_dir(entry, prune_dirs):
+                        stack.append(entry.path)
+                elif entry.name in ENTRY_POINT_FILENAMES:
+                    return True
+            except OSError:
+                continue
+    return False
+
+def scan_project(root, prune_dirs=None):
+    """
+    Walk the project once with os.scandir, skipping vendored trees (virtualenvs,
+    node_modules, caches), and return a manifest of entry points, dependency files,
+    output directories, backend candidates and languages. Paths are relative to root.
+    """
+    if prune_dirs is None:
+        prune_dirs = DEFAULT_PRUNE_DIRS
+    root = os.path.abspath(root)
+    manifest = {
+        "root": root,
+        "entry_points": [],
+        "dependency_files": [],
+        "output_dirs": [],
+        "backend_candidates": [],
+        "languages": {},
+        "pruned_dirs": [],
+    }
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        rel_dir = os.path.relpath(current, root)
+        file_names = set()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"[Init] Warning: could not scan {current}: {e}")
+            continue
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            rel_path = os.path.normpath(os.path.join(rel_dir, entry.name))
+            if is_dir:
+                if is_pruned_dir(entry, prune_dirs):
+                    manifest["pruned_dirs"].append(rel_path)
+                    continue
+                if entry.name in OUTPUT_DIR_NAMES:
+                    manifest["output_dirs"].append(rel_path)
+                stack.append(entry.path)
+                continue
+            file_names.add(entry.name)
+            if entry.name in ENTRY_POINT_FILENAMES:
+                manifest["entry_points"].append(rel_path)
+            if entry.name in DEPENDENCY_FILENAMES:
+                manifest["dependency_files"].append(rel_path)
+            language = LANGUAGE_EXTENSIONS.get(os.path.splitext(entry.name)[1].lower())
+            if language:
+                manifest["languages"][language] = manifest["languages"].get(language, 0) + 1
+        if "app.py" in file_names and "requirements.txt" in file_names:
+            manifest["backend_candidates"].append(os.path.normpath(rel_dir))
+    for key in ("entry_points", "dependency_files", "output_dirs", "backend_candidates", "pruned_dirs"):
+        manifest[key].sort()
+    return manifest
+
+def detect_backend_dir(project_root, manifest=None):
     """
     Detect backend-python directory. Tries:
     - project_root/ConversationalChatbot/backend-python
     - project_root/extracted_projects/5_20251104_215514_591515/ConversationalChatbot/backend-python
     - project_root/backend-python
-    - Recursive search for a dir named 'backend-python' containing 'app.py'
+    - Any 'backend-python' dir containing 'app.py' listed in the project manifest
     """
     candidates = [
         os.path.join(project_root, "ConversationalChatbot", "backend-python"),
@@ -178,10 +583,12 @@ def detect_backend_dir(project_root):
         if os.path.isfile(os.path.join(c, "app.py")) and os.path.isfile(os.path.join(c, "requirements.txt")):
             return c
 
-    # Fallback: recursive search
-    for root, dirs, files in os.walk(project_root):
-        if "app.py" in files and "requirements.txt" in files and os.path.basename(root) == "backend-python":
-            return root
+    # Fallback: pruned manifest scan (never descends into bundled venvs)
+    if manifest is None:
+        manifest = scan_project(project_root)
+    for rel in manifest["backend_candidates"]:
+        if os.path.basename(rel) == "backend-python":
+            return os.path.join(manifest["root"], rel)
 
     raise FileNotFoundError("Could not locate backend-python directory with app.py and requirements.txt under the provided project root.")
 
@@ -226,8 +633,12 @@ def main():
     project_root = norm(project_root)
     print(f"[Init] Using project root: {project_root}")
 
+    # Scan the project once; later steps reuse this manifest
+    manifest = scan_project(project_root)
+    print(f"[Init] Project manifest: entry points={manifest['entry_points']}, languages={manifest['languages']}")
+
     # Detect backend-python directory
-    backend_dir = detect_backend_dir(project_root)
+    backend_dir = detect_backend_dir(project_root, manifest)
     backend_dir = norm(backend_dir)
     print(f"[Init] Detected backend directory: {backend_dir}")
 
@@ -246,28 +657,24 @@ def main():
     # Install dependencies
     install_requirements(pip_exe, requirements_path)
 
-    # Launch Flask backend
-    proc = launch_flask_app(python_exe, app_path, backend_dir)
+    # Launch Flask backend on a port of its own
+    port = allocate_port()
+    proc = launch_flask_app(python_exe, app_path, backend_dir, port)
 
-    # Optionally, capture some startup logs briefly
-    time.sleep(1.0)
-    print("[Run] Waiting for backend health to become ready...")
-    base_url = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
-    health = None
+    drainer = LogDrainer(proc.stdout).start()
+    print("[Run] Waiting for backend to become ready...")
     try:
-        health = wait_for_health(base_url, timeout=60.0, interval=1.0)
+        health, startup = wait_for_ready(proc, drainer, DEFAULT_HOST, port, timeout=60.0)
     except Exception as e:
-        # Drain any logs to help diagnose
-        try:
-            print("[Run] Backend output (last 50 lines):")
-            out = proc.stdout.read() if proc and proc.stdout else ""
-            lines = out.splitlines()[-50:]
-            for ln in lines:
-                print(ln)
-        except Exception:
-            pass
+        # Show the captured logs to help diagnose
+        print("[Run] Backend output (last 50 lines):")
+        for ln in drainer.tail(50):
+            print(ln)
         safe_terminate(proc)
         raise
+    print(f"[Run] Backend ready: bind message at {startup['bind_message_s']}s, "
+          f"socket open at {startup['socket_open_s']}s, healthy at {startup['healthy_s']}s")
+    base_url = f"http://{DEFAULT_HOST}:{port}"
 
     # Extract session ID from health
     session_id = str(health.get("session_id"))
@@ -278,14 +685,30 @@ def main():
     designated_output_dir = get_designated_output_dir(project_root, backend_dir)
     print(f"[Run] Designated output directory (read only): {designated_output_dir}")
 
-    # Prepare inputs
-    inputs = parse_batched_inputs(BATCHED_INPUTS_TEXT)
-    print(f"[Run] Prepared {len(inputs)} batched inputs for a single session.")
+    # Prepare inputs (streamed; nothing is materialised up front)
+    suite_path = os.environ.get(INPUT_SUITE_ENV)
+    print(f"[Run] Streaming inputs from: {suite_path or 'built-in batched inputs'}")
 
     # Send each input, then read and print session file
-    for idx, question in enumerate(inputs, start=1):
+    current_session = None
+    session_started_at = time.time()
+    for idx, item in enumerate(iter_inputs(), start=1):
+        if current_session is not None and item["session"] != current_session:
+            # A new suite session starts a fresh backend session
+            try:
+                session_id = reset_session(base_url, session_id, session_started_at)
+                session_started_at = time.time()
+                print(f"\n[Run] Suite session '{item['session']}' -> backend session {session_id}")
+            except Exception as e:
+                print(f"[Run {idx}] Error resetting session for '{item['session']}': {e}")
+                safe_terminate(proc)
+                raise
+        current_session = item["session"]
+        question = item["prompt"]
         payload = {"user_message": question}
-        print(f"\n[Run {idx}] Sending message: {question}")
+        print(f"\n[Run {idx}] Sending message ({item['session']}/{item['id']}): {question}")
+        if item["expected"]:
+            print(f"[Run {idx}] Expected: {item['expected']}")
         try:
             resp = http_post_json(base_url + CHAT_ENDPOINT, payload, timeout=10.0)
             assistant_response = resp.get("assistant_response", "")
@@ -347,6 +770,7 @@ def main():
     print(f"[Final] Total conversations: {len(final_session_data.get('conversations', []))}")
 
     # Clean up
+    HTTP_CLIENT.close()
     safe_terminate(proc)
     print("[Done] Backend process terminated. All steps completed successfully.")
 
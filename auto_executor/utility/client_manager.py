@@ -0,0 +1,173 @@
+import os
+import random
+import re
+import threading
+import time
+
+from loguru import logger
+
+from utility.azure_api import AzureOpenAIClient
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# upload_file reports failures as text; these mark a transient one worth retrying
+TRANSIENT_ERROR_PATTERN = re.compile(r'\b(408|409|429|50[0234])\b|rate limit|timed? ?out|temporarily|connection', re.I)
+
+
+def parse_limits(spec):
+    """Parse 'deployment=N,other=M' into a dict"""
+    limits = {}
+    for part in (spec or '').split(','):
+        if '=' in part:
+            name, value = part.split('=', 1)
+            limits[name.strip()] = int(value)
+    return limits
+
+
+def error_status(error):
+    """HTTP status carried by an SDK exception, if any"""
+    status = getattr(error, 'status_code', None)
+    if status is None and getattr(error, 'response', None) is not None:
+        status = getattr(error.response, 'status_code', None)
+    return status
+
+
+def retry_after_seconds(error):
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # No status: connection resets and timeouts
+    return isinstance(error, (ConnectionError, TimeoutError)) or 'Timeout' in type(error).__name__ \
+        or 'Connection' in type(error).__name__
+
+
+class ClientManager:
+    """
+    One long-lived AzureOpenAIClient shared by every request and worker thread.
+
+    The wrapped client (and the SDK's keep-alive connection pool inside it) is built
+    once. Calls are bounded per deployment by semaphores, retried with full-jitter
+    exponential backoff on 429/5xx and connection errors (honouring Retry-After),
+    and counted for the /stats endpoint. upload_file and get_completion keep the
+    AzureOpenAIClient signatures, so the manager is a drop-in replacement.
+    """
+
+    def __init__(self, default_limit=4, deployment_limits=None, max_retries=4, backoff_base=1.0, backoff_cap=30.0,
+                 default_deployment='default'):
+        self.client = AzureOpenAIClient()
+        self.default_limit = default_limit
+        self.deployment_limits = deployment_limits or {}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.default_deployment = default_deployment
+        self._semaphores = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _semaphore(self, deployment):
+        with self._lock:
+            if deployment not in self._semaphores:
+                limit = self.deployment_limits.get(deployment, self.default_limit)
+                self._semaphores[deployment] = threading.BoundedSemaphore(limit)
+                self._stats[deployment] = {
+                    'limit': limit, 'in_flight': 0, 'waiting': 0, 'calls': 0, 'attempts': 0,
+                    'retries': 0, 'throttled': 0, 'failures': 0, 'total_seconds': 0.0
+                }
+            return self._semaphores[deployment]
+
+    def _count(self, deployment, **deltas):
+        with self._lock:
+            stats = self._stats[deployment]
+            for key, delta in deltas.items():
+                stats[key] += delta
+
+    def _backoff(self, attempt, error=None):
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        hinted = retry_after_seconds(error) if error is not None else None
+        return max(delay, hinted) if hinted is not None else delay
+
+    def call(self, deployment, fn, *args, is_transient_result=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) under the deployment's concurrency limit, retrying
+        transient failures. is_transient_result(result) can flag failures that are
+        returned rather than raised. The limit is held per attempt, not across the
+        backoff sleep, so a throttled call does not block other jobs while it waits.
+        """
+        deployment = deployment or self.default_deployment
+        semaphore = self._semaphore(deployment)
+        self._count(deployment, calls=1)
+        started = time.monotonic()
+        try:
+            attempt = 0
+            while True:
+                self._count(deployment, waiting=1)
+                with semaphore:
+                    self._count(deployment, waiting=-1, in_flight=1, attempts=1)
+                    try:
+                        result = fn(*args, **kwargs)
+                    except Exception as e:
+                        if attempt >= self.max_retries or not is_retryable(e):
+                            self._count(deployment, failures=1)
+                            raise
+                        if error_status(e) == 429:
+                            self._count(deployment, throttled=1)
+                        delay = self._backoff(attempt, e)
+                        logger.warning(f"Azure call on '{deployment}' failed ({e}); retry {attempt + 1} in {delay:.1f}s")
+                    else:
+                        if is_transient_result is None or not is_transient_result(result) or attempt >= self.max_retries:
+                            return result
+                        delay = self._backoff(attempt)
+                        logger.warning(f"Azure call on '{deployment}' returned a transient failure; retry {attempt + 1} in {delay:.1f}s")
+                    finally:
+                        self._count(deployment, in_flight=-1)
+                self._count(deployment, retries=1)
+                attempt += 1
+                time.sleep(delay)
+        finally:
+            self._count(deployment, total_seconds=time.monotonic() - started)
+
+    def upload_file(self, file_path, purpose='assistants'):
+        return self.call('files', self.client.upload_file, file_path, purpose=purpose,
+                         is_transient_result=lambda r: not r['success'] and bool(TRANSIENT_ERROR_PATTERN.search(str(r.get('error')))))
+
+    def get_completion(self, deployment=None, **kwargs):
+        """deployment selects the concurrency limit and stats bucket; the wrapped client picks the model as configured"""
+        return self.call(deployment, self.client.get_completion, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            snapshot = {name: dict(values) for name, values in self._stats.items()}
+        for values in snapshot.values():
+            values['retry_rate'] = round(values['retries'] / values['attempts'], 4) if values['attempts'] else 0.0
+            values['mean_seconds'] = round(values['total_seconds'] / values['calls'], 3) if values['calls'] else 0.0
+            values['total_seconds'] = round(values['total_seconds'], 3)
+        return snapshot
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_client_manager():
+    """Return the process-wide ClientManager, creating it on first use from environment settings"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ClientManager(
+                    default_limit=int(os.environ.get('AZURE_MAX_CONCURRENCY', '4')),
+                    deployment_limits=parse_limits(os.environ.get('AZURE_DEPLOYMENT_LIMITS')),
+                    max_retries=int(os.environ.get('AZURE_MAX_RETRIES', '4')),
+                    default_deployment=os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'default')
+                )
+                logger.info("Created shared Azure OpenAI client manager")
+    return _manager
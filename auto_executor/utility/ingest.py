@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import zipfile
+
+from loguru import logger
+
+CHUNK_SIZE = 1024 * 1024
+ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')  # local file header, or the end record of an empty archive
+MAX_UNCOMPRESSED_BYTES = 2 * 1024 * 1024 * 1024
+MAX_MEMBERS = 100000
+
+# Directories that hold dependencies, caches or tooling rather than submission sources
+VENDORED_DIR_NAMES = {
+    '.git', '.hg', '.svn', '.idea', '.vscode', '__MACOSX',
+    '__pycache__', '.mypy_cache', '.pytest_cache', '.ruff_cache', '.tox', '.nox',
+    'venv', '.venv', 'site-packages', 'dist-packages', 'node_modules', 'bower_components'
+}
+
+# Left out of the archive uploaded to Azure: build output, compiled and binary files, and oversized members
+BUILD_DIR_NAMES = {'build', 'dist', 'target', 'bin', 'obj', '.next', '.nuxt', '.parcel-cache', '.gradle', 'coverage', 'htmlcov'}
+BINARY_EXTENSIONS = (
+    '.pyc', '.pyo', '.pyd', '.so', '.dll', '.dylib', '.exe', '.o', '.a', '.lib', '.class', '.jar', '.war', '.whl', '.egg',
+    '.zip', '.tar', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar',
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.mp3', '.mp4', '.wav', '.mov', '.avi',
+    '.pdf', '.ttf', '.otf', '.woff', '.woff2', '.db', '.sqlite', '.sqlite3', '.pkl', '.pt', '.bin', '.onnx', '.h5', '.npy'
+)
+MAX_SLIM_MEMBER_BYTES = 5 * 1024 * 1024
+
+
+class InvalidArchive(ValueError):
+    pass
+
+
+def stream_to_disk(stream, path, chunk_size=CHUNK_SIZE):
+    """
+    Copy stream to path in fixed-size chunks, hashing as it goes.
+
+    The first chunk must start with a zip signature; anything else is rejected before
+    the rest of the body is read. Returns (sha256, size).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'wb') as out:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            if size == 0 and not chunk.startswith(ZIP_MAGIC):
+                raise InvalidArchive("File is not a zip archive")
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    if size == 0:
+        raise InvalidArchive("Uploaded file is empty")
+    return digest.hexdigest(), size
+
+
+def is_vendored(name, venv_roots=()):
+    parts = name.split('/')
+    if any(part in VENDORED_DIR_NAMES for part in parts[:-1]):
+        return True
+    return any(name.startswith(root) for root in venv_roots)
+
+
+def build_manifest(zip_path):
+    """
+    Read the archive's central directory (not its members) and describe every entry.
+
+    Rejects archives whose central directory is corrupt, whose paths escape the
+    extraction root, or whose uncompressed size or member count is implausible.
+    """
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            infos = zf.infolist()
+    except zipfile.BadZipFile as e:
+        raise InvalidArchive(f"Invalid zip file: {e}")
+
+    if len(infos) > MAX_MEMBERS:
+        raise InvalidArchive(f"Archive has {len(infos)} entries (limit {MAX_MEMBERS})")
+
+    # A pyvenv.cfg marks a bundled virtualenv, whatever its directory is called
+    venv_roots = tuple(posixpath.dirname(info.filename) + '/' for info in infos
+                       if posixpath.basename(info.filename) == 'pyvenv.cfg')
+
+    members = []
+    total_uncompressed = 0
+    top_level = set()
+    for info in infos:
+        name = info.filename
+        normalized = posixpath.normpath(name)
+        if name.startswith(('/', '\\')) or normalized == '..' or normalized.startswith('../') or ':' in name.split('/')[0]:
+            raise InvalidArchive(f"Unsafe path in archive: {name}")
+        total_uncompressed += info.file_size
+        top_level.add(name.split('/')[0])
+        members.append({
+            'name': name,
+            'is_dir': info.is_dir(),
+            'size': info.file_size,
+            'compressed_size': info.compress_size,
+            'crc': info.CRC,
+            'vendored': is_vendored(name, venv_roots)
+        })
+    if total_uncompressed > MAX_UNCOMPRESSED_BYTES:
+        raise InvalidArchive(f"Archive expands to {total_uncompressed} bytes (limit {MAX_UNCOMPRESSED_BYTES})")
+
+    files = [m for m in members if not m['is_dir']]
+    vendored = [m for m in files if m['vendored']]
+    return {
+        'member_count': len(files),
+        'uncompressed_bytes': total_uncompressed,
+        'vendored_member_count': len(vendored),
+        'vendored_bytes': sum(m['size'] for m in vendored),
+        'top_level': sorted(top_level),
+        'members': members
+    }
+
+
+def ingest_upload(file, zip_path, manifest_path=None):
+    """
+    Save an uploaded zip in one pass: stream it to zip_path while hashing, then
+    validate its central directory and build the member manifest.
+
+    Returns {'sha256', 'size', 'manifest'}; the manifest is also written to
+    manifest_path when given. The partial file is removed if validation fails.
+    """
+    try:
+        content_hash, size = stream_to_disk(file.stream, zip_path)
+        manifest = build_manifest(zip_path)
+    except InvalidArchive:
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        raise
+    manifest['sha256'] = content_hash
+    manifest['archive_bytes'] = size
+    if manifest_path:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+    logger.info(f"Ingested {zip_path}: {size} bytes, {manifest['member_count']} members "
+                f"({manifest['vendored_member_count']} vendored)")
+    return {'sha256': content_hash, 'size': size, 'manifest': manifest}
+
+
+def load_manifest(manifest_path):
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def extract_members(zip_path, manifest, extract_to, include_vendored=False):
+    """
+    Extract the manifest's members from the archive on disk, skipping vendored
+    trees unless include_vendored. Returns the number of files written.
+    """
+    selected = [m for m in manifest['members'] if include_vendored or not m['vendored']]
+    os.makedirs(extract_to, exist_ok=True)
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        zf.extractall(extract_to, members=[m['name'] for m in selected])
+    return sum(1 for m in selected if not m['is_dir'])
+
+
+def slim_reason(member):
+    """Why a manifest member is left out of the slim archive, or None to keep it"""
+    name = member['name']
+    if member['vendored']:
+        return 'vendored'
+    parts = name.rstrip('/').split('/')
+    if any(part in BUILD_DIR_NAMES or part.endswith('.egg-info') for part in parts[:-1]):
+        return 'build_output'
+    if member['is_dir']:
+        return 'build_output' if parts[-1] in BUILD_DIR_NAMES else None
+    if name.lower().endswith(BINARY_EXTENSIONS):
+        return 'binary'
+    if member['size'] > MAX_SLIM_MEMBER_BYTES:
+        return 'oversized'
+    return None
+
+
+def build_slim_archive(zip_path, manifest, slim_path):
+    """
+    Repackage the archive with only project sources, manifests and data, leaving out
+    vendored environments, build output, binaries and oversized files. Member paths
+    are unchanged, so the slim archive describes the same project layout.
+
+    Returns {'path', 'member_count', 'bytes', 'original_bytes', 'ratio', 'skipped'}, where
+    ratio is original over slim size and skipped counts members per reason. When
+    nothing would be left out the original archive is used as is.
+    """
+    original_bytes = os.path.getsize(zip_path)
+    kept, skipped = [], {}
+    for member in manifest['members']:
+        reason = slim_reason(member)
+        if reason is None:
+            kept.append(member)
+        elif not member['is_dir']:
+            skipped[reason] = skipped.get(reason, 0) + 1
+
+    if not skipped:
+        path = zip_path
+    else:
+        path = slim_path
+        with zipfile.ZipFile(zip_path, 'r') as src, \
+                zipfile.ZipFile(slim_path, 'w', compression=zipfile.ZIP_DEFLATED) as dst:
+            for member in kept:
+                info = src.getinfo(member['name'])
+                if info.is_dir():
+                    dst.writestr(info, b'')
+                    continue
+                slim_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                slim_info.compress_type = zipfile.ZIP_DEFLATED
+                slim_info.external_attr = info.external_attr
+                with src.open(info) as f_in, dst.open(slim_info, 'w') as f_out:
+                    shutil.copyfileobj(f_in, f_out, CHUNK_SIZE)
+    slim_bytes = os.path.getsize(path)
+    return {
+        'path': path,
+        'member_count': sum(1 for m in kept if not m['is_dir']),
+        'bytes': slim_bytes,
+        'original_bytes': original_bytes,
+        'ratio': round(original_bytes / slim_bytes, 2) if slim_bytes else None,
+        'skipped': skipped
+    }
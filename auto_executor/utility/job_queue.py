@@ -0,0 +1,206 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from loguru import logger
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by SQLite, drained by a pool of background worker threads.
+
+    Jobs survive restarts: anything still queued is picked up again, and jobs left
+    'running' by a process that no longer exists are re-queued on startup.
+    The handler is called as handler(job_id, payload, report_stage) and returns a
+    JSON-serialisable result; report_stage(name) records stage-level progress.
+    """
+
+    def __init__(self, db_path, handler, worker_count=2, poll_interval=1.0):
+        self.db_path = db_path
+        self.handler = handler
+        self.worker_count = worker_count
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._workers = []
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    stages TEXT NOT NULL DEFAULT '[]',
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    owner_pid INTEGER,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+        self._recover_orphans()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Autocommit connection per call; _claim opens its own write transaction
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.utcnow().isoformat()
+
+    @staticmethod
+    def _pid_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, OSError):
+            return True
+        return True
+
+    def _recover_orphans(self):
+        """Re-queue jobs whose worker process died mid-run."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, owner_pid FROM jobs WHERE status = 'running'").fetchall()
+            for row in rows:
+                if row['owner_pid'] and row['owner_pid'] != os.getpid() and self._pid_alive(row['owner_pid']):
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = 'requeued', owner_pid = NULL WHERE id = ? AND status = 'running'",
+                    (row['id'],)
+                )
+                logger.warning(f"Re-queued orphaned job {row['id']}")
+
+    def start(self):
+        """Start the worker threads"""
+        for n in range(self.worker_count):
+            worker = threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        logger.info(f"Job queue started with {self.worker_count} worker(s) on {self.db_path}")
+        return self
+
+    def stop(self, timeout=None):
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def submit(self, payload, job_id=None):
+        """Persist a new job and wake a worker; returns the job id"""
+        job_id = job_id or uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, stage, payload, created_at) VALUES (?, 'queued', 'queued', ?, ?)",
+                (job_id, json.dumps(payload), self._now())
+            )
+        with self._wakeup:
+            self._wakeup.notify()
+        logger.info(f"Enqueued job {job_id}")
+        return job_id
+
+    def get(self, job_id):
+        """Return the job as a dict, or None if it does not exist"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row['status'] == 'queued':
+                position = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (row['created_at'],)
+                ).fetchone()[0]
+        return {
+            'job_id': row['id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'stages': json.loads(row['stages']),
+            'queue_position': position,
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error']
+        }
+
+    def _claim(self):
+        """Atomically move the oldest queued job to 'running'; returns (job_id, payload) or None"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, payload FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', owner_pid = ?, started_at = ? WHERE id = ?",
+                        (os.getpid(), self._now(), row['id'])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row['id'], json.loads(row['payload'])
+
+    def report_stage(self, job_id, stage):
+        """Record that a job entered a new stage"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            stages = json.loads(row['stages']) if row else []
+            stages.append({'stage': stage, 'at': self._now()})
+            conn.execute("UPDATE jobs SET stage = ?, stages = ? WHERE id = ?", (stage, json.dumps(stages), job_id))
+        logger.info(f"Job {job_id}: {stage}")
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, result = ?, error = ?, finished_at = ?, owner_pid = NULL WHERE id = ?",
+                (status, status, json.dumps(result) if result is not None else None, error, self._now(), job_id)
+            )
+
+    def _work(self):
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+            try:
+                claimed = self._claim()
+            except sqlite3.Error as e:
+                logger.error(f"Job queue claim failed: {e}")
+                claimed = None
+            if claimed is None:
+                # Woken by submit(), or poll so jobs enqueued by other processes are seen too
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(self.poll_interval)
+                continue
+            job_id, payload = claimed
+            started = time.monotonic()
+            logger.info(f"Worker {threading.current_thread().name} started job {job_id}")
+            try:
+                result = self.handler(job_id, payload, lambda stage: self.report_stage(job_id, stage))
+                self._finish(job_id, 'completed', result=result)
+                logger.success(f"Job {job_id} completed in {time.monotonic() - started:.1f}s")
+            except Exception as e:
+                logger.exception(f"Job {job_id} failed: {str(e)}")
+                self._finish(job_id, 'failed', error=str(e))
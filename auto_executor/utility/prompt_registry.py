@@ -0,0 +1,154 @@
+import hashlib
+import os
+import string
+import threading
+
+from loguru import logger
+
+DEFAULT_TEMPLATE = 'askbit'
+
+# Template kind -> (directory, placeholders it may use). None means the file is data, not a format string.
+TEMPLATE_KINDS = {
+    'analysis': (os.path.join('prompts', 'instructions', 'analysis'), {'file_id', 'problem_statement', 'user_story'}),
+    'script_gen': (os.path.join('prompts', 'instructions', 'script_gen'), {'file_id', 'multiple_run_data', 'output_file_path'}),
+    'run_data': ('test_data', None)
+}
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class PromptTemplate:
+    """One prompt file, parsed and checked once; render() only formats the cached text"""
+
+    def __init__(self, kind, name, path, text, mtime, allowed_fields):
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self.text = text
+        self.mtime = mtime
+        self.version = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        self.is_format = allowed_fields is not None
+        self.fields = set()
+        if self.is_format:
+            try:
+                self.fields = {field.split('.')[0].split('[')[0]
+                               for _, field, _, _ in string.Formatter().parse(text) if field is not None}
+            except ValueError as e:
+                raise TemplateError(f"{path}: {e}")
+            if '' in self.fields or any(field.isdigit() for field in self.fields):
+                raise TemplateError(f"{path}: positional placeholders are not supported")
+            unknown = self.fields - allowed_fields
+            if unknown:
+                raise TemplateError(f"{path}: unknown placeholder(s) {', '.join(sorted(unknown))}")
+
+    def render(self, **values):
+        return self.text.format(**values) if self.is_format else self.text
+
+
+class PromptRegistry:
+    """
+    Every prompt template, loaded and validated at startup and held in memory.
+
+    Templates are named after the problem statement they serve (askbit.txt, ...);
+    get() falls back to DEFAULT_TEMPLATE for problem statements without their own.
+    A background thread re-reads only files whose mtime changed; an edit that fails
+    validation is logged and the previous version stays in service.
+    """
+
+    def __init__(self, root='.', poll_interval=2.0):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._templates = {}
+        self._rejected = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._watcher = None
+        errors = self._scan()
+        if errors:
+            raise TemplateError("Invalid prompt templates:\n" + "\n".join(errors))
+        for kind in TEMPLATE_KINDS:
+            if (kind, DEFAULT_TEMPLATE) not in self._templates:
+                logger.warning(f"No default '{DEFAULT_TEMPLATE}' template for {kind}")
+        logger.info(f"Loaded {len(self._templates)} prompt template(s)")
+
+    def _scan(self):
+        """Load new and modified templates and drop deleted ones; returns validation errors"""
+        errors = []
+        seen = set()
+        for kind, (directory, allowed_fields) in TEMPLATE_KINDS.items():
+            directory = os.path.join(self.root, directory)
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if not entry.is_file() or not entry.name.endswith('.txt'):
+                    continue
+                key = (kind, entry.name[:-len('.txt')])
+                seen.add(key)
+                mtime = entry.stat().st_mtime_ns
+                current = self._templates.get(key)
+                if (current is not None and current.mtime == mtime) or self._rejected.get(key) == mtime:
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        template = PromptTemplate(kind, key[1], entry.path, f.read(), mtime, allowed_fields)
+                except (OSError, UnicodeDecodeError, TemplateError) as e:
+                    # Reported once per modification, not on every poll
+                    self._rejected[key] = mtime
+                    errors.append(str(e))
+                    continue
+                self._rejected.pop(key, None)
+                with self._lock:
+                    self._templates[key] = template
+                if current is not None:
+                    logger.info(f"Reloaded prompt template {entry.path} (version {template.version})")
+        with self._lock:
+            for key in set(self._templates) - seen:
+                logger.info(f"Prompt template {self._templates.pop(key).path} was removed")
+        return errors
+
+    def start(self):
+        """Start the mtime watcher thread"""
+        self._watcher = threading.Thread(target=self._watch, name='prompt-watcher', daemon=True)
+        self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+    def _watch(self):
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                for error in self._scan():
+                    logger.error(f"Keeping previous prompt template: {error}")
+            except OSError as e:
+                logger.error(f"Prompt template scan failed: {e}")
+
+    def find(self, kind, problem_statement_id=None):
+        """Return the template for problem_statement_id, or the default one, or None if neither exists"""
+        with self._lock:
+            for name in (problem_statement_id, (problem_statement_id or '').lower(), DEFAULT_TEMPLATE):
+                template = self._templates.get((kind, name))
+                if template is not None:
+                    return template
+        return None
+
+    def get(self, kind, problem_statement_id=None):
+        """Like find(), but a missing template is an error"""
+        template = self.find(kind, problem_statement_id)
+        if template is None:
+            raise TemplateError(f"No {kind} template for '{problem_statement_id}' and no '{DEFAULT_TEMPLATE}' fallback")
+        return template
+
+    def version(self, problem_statement_id=None):
+        """Combined version of every template a submission for problem_statement_id would use"""
+        digest = hashlib.sha256()
+        for kind in TEMPLATE_KINDS:
+            try:
+                digest.update(f"{kind}:{self.get(kind, problem_statement_id).version};".encode('utf-8'))
+            except TemplateError:
+                digest.update(f"{kind}:-;".encode('utf-8'))
+        return digest.hexdigest()[:16]
@@ -0,0 +1,212 @@
+import ast
+import os
+import posixpath
+import re
+import threading
+import zipfile
+
+from loguru import logger
+
+from utility.speculation import same_output_path
+
+OVERRIDES_BEGIN = '# BEGIN PROJECT OVERRIDES'
+OVERRIDES_END = '# END PROJECT OVERRIDES'
+CANONICAL_RUNNER = os.path.join('sandbox', 'auto_executor.py')
+
+# Field names a chat route may read from the request / write into its response, in order of preference
+REQUEST_FIELDS = ('user_message', 'message', 'prompt', 'query', 'question', 'user_input', 'input')
+RESPONSE_FIELDS = ('assistant_response', 'response', 'reply', 'answer', 'bot_response', 'assistant', 'message')
+CANONICAL_HEALTH_MARKER = 'Python Flask Backend'
+
+
+class EntryModuleFacts(ast.NodeVisitor):
+    """Request keys, response keys, session file name patterns and string literals of a backend entry module"""
+
+    def __init__(self):
+        self.imports = set()
+        self.accessed_keys = set()
+        self.response_keys = set()
+        self.session_files = set()
+        self.strings = set()
+
+    def visit_Import(self, node):
+        self.imports.update(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.imports.add(node.module)
+
+    def visit_Subscript(self, node):
+        if isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+            self.accessed_keys.add(node.slice.value)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute) and node.func.attr == 'get' and node.args \
+                and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+            self.accessed_keys.add(node.args[0].value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node):
+        self.response_keys.update(k.value for k in node.keys if isinstance(k, ast.Constant) and isinstance(k.value, str))
+        self.generic_visit(node)
+
+    def visit_JoinedStr(self, node):
+        # f"session_{session_id}.json" -> 'session_{}.json'
+        parts = [v.value if isinstance(v, ast.Constant) else '{}' for v in node.values]
+        pattern = ''.join(parts)
+        if pattern.count('{}') == 1 and pattern.endswith(('.json', '.txt')) and '/' not in pattern:
+            self.session_files.add(pattern)
+        # Literal parts of the f-string are not separate constants to visit
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            self.strings.add(node.value)
+
+
+class RunnerArchetype:
+    """
+    A project shape the canonical runner handles once its constants are overridden.
+
+    requires_imports are modules the entry module must import (any one of them), and
+    launch_check(facts) confirms the app can be started the way the runner starts it.
+    """
+
+    def __init__(self, name, requires_imports, launch_check, template_path=CANONICAL_RUNNER):
+        self.name = name
+        self.requires_imports = requires_imports
+        self.launch_check = launch_check
+        self.template_path = template_path
+
+    def fits(self, facts):
+        return any(name == module or name.startswith(module + '.') for module in self.requires_imports
+                   for name in facts.imports) and self.launch_check(facts)
+
+
+# Flask apps are started through the runner's LAUNCH_SHIM, which forces the port onto app.run();
+# plain http.server apps must take their port from the environment the runner exports.
+ARCHETYPES = [
+    RunnerArchetype('flask_chat_session', ('flask',), lambda facts: True),
+    RunnerArchetype('http_server_chat_session', ('http.server',),
+                    lambda facts: bool({'PORT', 'FLASK_RUN_PORT', 'RUNNER_PORT'} & facts.strings))
+]
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def load_template(path):
+    """Read and cache a runner template, checking it still carries the overrides markers"""
+    with _templates_lock:
+        if path not in _templates:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if text.count(OVERRIDES_BEGIN) != 1 or text.count(OVERRIDES_END) != 1:
+                raise ValueError(f"{path} has no '{OVERRIDES_BEGIN}' / '{OVERRIDES_END}' block")
+            _templates[path] = text
+        return _templates[path]
+
+
+def render_runner(template_path, overrides):
+    """Return the runner at template_path with its overrides block set to overrides"""
+    text = load_template(template_path)
+    head, rest = text.split(OVERRIDES_BEGIN, 1)
+    _, tail = rest.split(OVERRIDES_END, 1)
+    lines = [f'{name} = {value!r}' for name, value in overrides.items()]
+    script = head + OVERRIDES_BEGIN + '\n' + '\n'.join(lines) + '\n' + OVERRIDES_END + tail
+    compile(script, template_path, 'exec')
+    return script
+
+
+def pick_field(candidates, present, exclude=None):
+    return next((field for field in candidates if field in present and field != exclude), None)
+
+
+def match_archetype(zip_path, manifest, static_analysis):
+    """
+    Pick a runner archetype for a submission from its manifest and static analysis.
+
+    The backend must be a single module serving chat and health routes, with a
+    requirements.txt beside it, writing one session file per session into an output
+    directory directly below it. Returns {'archetype', 'template_path', 'path_output',
+    'overrides'} or None, logging why nothing matched.
+    """
+    evidence = static_analysis['evidence']
+    path_output = static_analysis['conclusion']['path_output']
+    if not path_output:
+        logger.info("No runner archetype: static analysis found no output directory")
+        return None
+
+    entries = [name for name, routes in evidence['routes'].items()
+               if any(re.search(r'chat', r, re.I) for r in routes) and '/health' in routes]
+    if len(entries) != 1:
+        logger.info(f"No runner archetype: {len(entries)} module(s) serve both chat and /health")
+        return None
+    entry = entries[0]
+    backend_dir = posixpath.dirname(entry)
+    if not backend_dir or posixpath.dirname(path_output) != backend_dir:
+        logger.info(f"No runner archetype: output directory {path_output} is not directly below {backend_dir or 'the archive root'}")
+        return None
+    names = {m['name'] for m in manifest['members']}
+    if posixpath.join(backend_dir, 'requirements.txt') not in names:
+        logger.info(f"No runner archetype: {backend_dir} has no requirements.txt")
+        return None
+
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        tree = ast.parse(zf.read(entry), filename=entry)
+    facts = EntryModuleFacts()
+    facts.visit(tree)
+
+    archetype = next((a for a in ARCHETYPES if a.fits(facts)), None)
+    request_field = pick_field(REQUEST_FIELDS, facts.accessed_keys)
+    response_field = pick_field(RESPONSE_FIELDS, facts.response_keys, exclude=request_field)
+    session_files = sorted(p for p in facts.session_files if p.startswith(('session', 'conversation', 'chat')))
+    problems = []
+    if archetype is None:
+        problems.append("no archetype fits how the entry module is served")
+    if request_field is None or response_field is None:
+        problems.append("chat request/response fields not recognised")
+    if len(session_files) != 1:
+        problems.append(f"{len(session_files)} session file name patterns")
+    if 'session_id' not in facts.response_keys:
+        problems.append("/health does not report a session_id")
+    if problems:
+        logger.info(f"No runner archetype for {entry}: {'; '.join(problems)}")
+        return None
+
+    overrides = {
+        'PROJECT_ZIP': os.path.abspath(zip_path),
+        'PROJECT_ROOT_DIRNAME_HINT': entry.split('/')[0],
+        'BACKEND_DIRNAME': posixpath.basename(backend_dir),
+        'BACKEND_APP_FILENAME': posixpath.basename(entry),
+        'CHAT_ROUTE': next(r for r in evidence['routes'][entry] if re.search(r'chat', r, re.I)),
+        'CHAT_REQUEST_FIELD': request_field,
+        'CHAT_RESPONSE_FIELD': response_field,
+        # Only the canonical backend announces itself; anything else is healthy if /health answers
+        'HEALTH_SERVICE_MARKER': CANONICAL_HEALTH_MARKER if CANONICAL_HEALTH_MARKER in facts.strings else '',
+        'OUTPUT_DIRNAME': posixpath.basename(path_output),
+        'SESSION_FILE_TEMPLATE': session_files[0].replace('{}', '{session_id}')
+    }
+    logger.info(f"Runner archetype '{archetype.name}' matches {entry}")
+    return {
+        'archetype': archetype.name,
+        'template_path': archetype.template_path,
+        'path_output': path_output,
+        'overrides': overrides
+    }
+
+
+def render_archetype(match, conclusion, run_data=None):
+    """
+    Render the matched runner if the analysis conclusion names the same output
+    directory as the match; returns the script or None. Non-empty lines of
+    run_data become the runner's BATCH_INPUTS.
+    """
+    if not same_output_path(match['path_output'], conclusion.get('path_output')):
+        logger.info(f"Conclusion path_output {conclusion.get('path_output')} differs from the archetype's {match['path_output']}")
+        return None
+    overrides = dict(match['overrides'])
+    batch_inputs = [line.strip() for line in (run_data or '').splitlines() if line.strip()]
+    if batch_inputs:
+        overrides['BATCH_INPUTS'] = batch_inputs
+    return render_runner(match['template_path'], overrides)
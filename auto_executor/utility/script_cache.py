@@ -0,0 +1,139 @@
+import contextlib
+import hashlib
+import json
+import os
+import posixpath
+import sqlite3
+from datetime import datetime
+
+from loguru import logger
+
+from utility.speculation import OUTPUT_DIR_NAMES, path_parts
+
+EXTRACT_DIR_PLACEHOLDER = '__EXTRACTED_PROJECT_PATH__'
+# Files whose paths make up the layout; data, docs and assets do not change how a project is run
+STRUCTURAL_EXTENSIONS = ('.py', '.js', '.jsx', '.mjs', '.ts', '.tsx', '.java', '.kt', '.cs', '.go')
+STRUCTURAL_FILENAMES = {'requirements.txt', 'pyproject.toml', 'setup.py', 'setup.cfg', 'Pipfile', 'package.json',
+                        'pom.xml', 'build.gradle', 'Dockerfile', '.env.example'}
+
+
+def is_structural(name):
+    parts = path_parts(name)
+    if any(part.lower() in OUTPUT_DIR_NAMES for part in parts[:-1]):
+        return False
+    basename = posixpath.basename(name)
+    return basename in STRUCTURAL_FILENAMES or basename.lower().endswith(STRUCTURAL_EXTENSIONS)
+
+
+def structural_fingerprint(manifest, static_analysis):
+    """
+    Hash of how a submission is laid out and run, not of what its files contain:
+    source and dependency file paths, entry modules with their routes, and the
+    directories they write output to. Returns (fingerprint, description).
+    """
+    evidence = static_analysis['evidence']
+    description = {
+        'layout': sorted(m['name'] for m in manifest['members']
+                         if not m['is_dir'] and not m['vendored'] and is_structural(m['name'])),
+        'routes': {name: sorted(set(routes)) for name, routes in sorted(evidence['routes'].items())},
+        'output_dirs': sorted(evidence['output_dirs']),
+        'path_output': static_analysis['conclusion']['path_output']
+    }
+    fingerprint = hashlib.sha256(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+    return fingerprint, description
+
+
+def templatize_script(script, extract_dir, submission_id):
+    """
+    Replace the submission's extraction path with a placeholder so the script can be
+    reused by another submission. Returns None if the script cannot be made portable:
+    it does not compile, never mentions the extraction path, or still names the
+    submission elsewhere.
+    """
+    try:
+        compile(script, '<generated script>', 'exec')
+    except (SyntaxError, ValueError):
+        return None
+    templated = script
+    for form in sorted({os.path.abspath(extract_dir), extract_dir}, key=len, reverse=True):
+        templated = templated.replace(form, EXTRACT_DIR_PLACEHOLDER)
+    if EXTRACT_DIR_PLACEHOLDER not in templated or submission_id in templated:
+        return None
+    return templated
+
+
+class ScriptCache:
+    """
+    SQLite cache of validated runner scripts keyed by structural fingerprint and
+    script-prompt version, so structurally identical submissions reuse a script
+    instead of another code-interpreter run. Scripts are stored with the extraction
+    path templated out and filled in again for each submission that reuses them.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scripts (
+                    fingerprint TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    script TEXT NOT NULL,
+                    structure TEXT NOT NULL,
+                    submission_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (fingerprint, prompt_version)
+                )
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, fingerprint, prompt_version):
+        """Return (templated script, source submission_id) for a structurally identical submission, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT script, submission_id FROM scripts WHERE fingerprint = ? AND prompt_version = ?",
+                (fingerprint, prompt_version)
+            ).fetchone()
+        return (row['script'], row['submission_id']) if row is not None else None
+
+    def record_hit(self, fingerprint, prompt_version):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scripts SET hits = hits + 1 WHERE fingerprint = ? AND prompt_version = ?", (fingerprint, prompt_version)
+            )
+
+    def store(self, fingerprint, prompt_version, structure, script, extract_dir, submission_id):
+        """Cache a generated script if it can be made portable; returns True if stored"""
+        templated = templatize_script(script, extract_dir, submission_id)
+        if templated is None:
+            logger.info(f"Not caching the script of {submission_id}: it is not portable across submissions")
+            return False
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scripts (fingerprint, prompt_version, script, structure, submission_id, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, prompt_version, templated, json.dumps(structure), submission_id, datetime.utcnow().isoformat())
+            )
+        logger.info(f"Cached the runner script of {submission_id} under fingerprint {fingerprint[:12]}")
+        return True
+
+    def stats(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS hits FROM scripts").fetchone()
+        return {'entries': row['entries'], 'hits': row['hits']}
+
+
+def fill_script(templated, extract_dir):
+    return templated.replace(EXTRACT_DIR_PLACEHOLDER, extract_dir)
@@ -0,0 +1,85 @@
+import posixpath
+import re
+import threading
+
+# Application logs are not session output, so a bare 'logs' directory is not one of these
+OUTPUT_DIR_NAMES = {'output', 'outputs', 'sessions', 'session_logs', 'conversations'}
+SESSION_FILE_PATTERN = re.compile(r'(session|conversation|chat)[^/]*\.(json|txt)$', re.I)
+
+
+def path_parts(path):
+    """Split a path as the model writes it ('project_root//team/output/', 'a\\b') into components"""
+    return [part for part in re.split(r'[\\/]+', path or '') if part not in ('', '.')]
+
+
+def predict_output_path(manifest):
+    """
+    Guess the analysis conclusion's path_output from the member manifest alone.
+
+    Prefers the directory holding session/conversation JSON or txt files, then an
+    output-like directory in a tree that contains Python sources. Returns a path
+    relative to the archive root, or None when there is no Python or no candidate.
+    """
+    files = [m['name'] for m in manifest['members'] if not m['is_dir'] and not m['vendored']]
+    python_dirs = {posixpath.dirname(name) for name in files if name.endswith('.py')}
+    if not python_dirs:
+        return None
+
+    session_dirs = sorted({posixpath.dirname(name) for name in files if SESSION_FILE_PATTERN.search(name)},
+                          key=lambda d: (d.count('/'), d))
+    for directory in session_dirs:
+        if directory and posixpath.basename(directory).lower() in OUTPUT_DIR_NAMES:
+            return directory
+
+    candidates = set()
+    for member in manifest['members']:
+        if member['vendored']:
+            continue
+        parts = path_parts(member['name'] if member['is_dir'] else posixpath.dirname(member['name']))
+        for depth in range(len(parts)):
+            if parts[depth].lower() in OUTPUT_DIR_NAMES:
+                candidates.add('/'.join(parts[:depth + 1]))
+    # Closest to a Python source directory wins, then the shallowest
+    def rank(directory):
+        parent = posixpath.dirname(directory)
+        return (parent not in python_dirs, posixpath.basename(directory).lower() != 'output', directory.count('/'), directory)
+    return min(candidates, key=rank) if candidates else None
+
+
+def same_output_path(predicted, actual):
+    """
+    True when the concluded path names the predicted directory. The model's path may
+    carry extra leading parts ('project_root/', '/mnt/data/...') but must contain the
+    whole prediction, so a bare 'output' never matches one of several output dirs.
+    """
+    predicted_parts, actual_parts = path_parts(predicted), path_parts(actual)
+    if not predicted_parts or len(actual_parts) < len(predicted_parts):
+        return False
+    return actual_parts[-len(predicted_parts):] == predicted_parts
+
+
+class SpeculationStats:
+    """Outcome counters for speculative script generation"""
+
+    OUTCOMES = ('kept', 'wasted', 'cancelled', 'not_predicted')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {outcome: 0 for outcome in self.OUTCOMES}
+        self._overlap_seconds = 0.0
+
+    def record(self, outcome, overlap_seconds=0.0):
+        with self._lock:
+            self._counts[outcome] += 1
+            self._overlap_seconds += overlap_seconds
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+            overlap_seconds = self._overlap_seconds
+        started = counts['kept'] + counts['wasted']
+        counts['started'] = started
+        counts['hit_rate'] = round(counts['kept'] / started, 4) if started else 0.0
+        # Time the kept speculative calls ran concurrently with analysis, i.e. latency saved
+        counts['seconds_saved'] = round(overlap_seconds, 3)
+        return counts
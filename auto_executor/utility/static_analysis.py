@@ -0,0 +1,232 @@
+import ast
+import posixpath
+import re
+import zipfile
+
+from utility.speculation import OUTPUT_DIR_NAMES, path_parts
+
+MAX_SOURCE_BYTES = 512 * 1024
+GENAI_MODULES = {
+    'openai', 'anthropic', 'langchain', 'langchain_openai', 'langchain_core', 'langchain_community', 'llama_index',
+    'google.generativeai', 'google.genai', 'vertexai', 'transformers', 'huggingface_hub', 'groq', 'mistralai', 'cohere', 'ollama', 'litellm'
+}
+ROUTE_DECORATORS = {'route', 'get', 'post', 'put', 'patch', 'delete', 'websocket'}
+CHAT_ROUTE_PATTERN = re.compile(r'chat|message|ask|conversation|query|prompt', re.I)
+PATH_FUNCTIONS = {'join', 'Path', 'PurePath', 'open', 'makedirs', 'mkdir'}
+PATH_NAME_PATTERN = re.compile(r'dir|path|folder|output|file', re.I)
+FOREIGN_SOURCE_EXTENSIONS = ('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.java', '.kt', '.cs', '.go')
+# Server-side languages whose presence means Python may not own the request flow
+FOREIGN_BACKEND_EXTENSIONS = ('.java', '.kt', '.cs', '.go')
+FOREIGN_GENAI_PATTERN = re.compile(r'openai|anthropic|generativeai|@google/genai|langchain|chat/completions|gemini-', re.I)
+FOREIGN_WRITE_PATTERN = re.compile(r'fs\.(promises\.)?writeFile|writeFileSync|appendFileSync|FileWriter|Files\.write|BufferedWriter')
+# A write only counts as session output when the source also names a JSON or session/conversation txt file
+FOREIGN_OUTPUT_PATTERN = re.compile(r'''(session|conversation|chat)[^'"\n]*\.(json|txt)|\.json['"]''', re.I)
+
+
+class ModuleFacts(ast.NodeVisitor):
+    """
+    What one Python module imports, which routes it serves (decorated, or compared
+    against a request path as http.server handlers do), where it writes, and which
+    output-like directory literals it uses to build paths.
+    """
+
+    def __init__(self):
+        self.imports = set()
+        self.routes = []
+        self.writes = []
+        self.output_literals = set()
+
+    def visit_Import(self, node):
+        self.imports.update(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node):
+        if node.module and not node.level:
+            # 'from google import genai' is recorded as google.genai
+            self.imports.update(f'{node.module}.{alias.name}' for alias in node.names)
+
+    def _visit_function(self, node):
+        for decorator in node.decorator_list:
+            if (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr in ROUTE_DECORATORS and decorator.args
+                    and isinstance(decorator.args[0], ast.Constant) and isinstance(decorator.args[0].value, str)
+                    and decorator.args[0].value.startswith('/')):
+                self.routes.append(decorator.args[0].value)
+        self.generic_visit(node)
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Compare(self, node):
+        for operand in [node.left] + node.comparators:
+            if isinstance(operand, ast.Constant) and isinstance(operand.value, str) \
+                    and operand.value.startswith('/') and len(operand.value) < 64:
+                self.routes.append(operand.value)
+        self.generic_visit(node)
+
+    def _path_literal(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and len(node.value) < 256 \
+                and not node.value.startswith(('/', '\\')):
+            if any(part.lower() in OUTPUT_DIR_NAMES for part in path_parts(node.value)):
+                self.output_literals.add(node.value)
+
+    def visit_Assign(self, node):
+        if any(isinstance(target, ast.Name) and PATH_NAME_PATTERN.search(target.id) for target in node.targets):
+            self._path_literal(node.value)
+        self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        # Path(__file__).parent / 'output'
+        if isinstance(node.op, ast.Div):
+            self._path_literal(node.right)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)
+        if name in PATH_FUNCTIONS:
+            for arg in node.args:
+                self._path_literal(arg)
+        if isinstance(func, ast.Attribute) and func.attr == 'dump' and isinstance(func.value, ast.Name) and func.value.id == 'json':
+            self.writes.append(('json.dump', node.lineno))
+        elif isinstance(func, ast.Name) and func.id == 'open':
+            mode = node.args[1] if len(node.args) > 1 else next((k.value for k in node.keywords if k.arg == 'mode'), None)
+            if isinstance(mode, ast.Constant) and isinstance(mode.value, str) and set(mode.value) & {'w', 'a'}:
+                self.writes.append((f"open(..., '{mode.value}')", node.lineno))
+        elif isinstance(func, ast.Attribute) and func.attr in ('write_text', 'write_bytes'):
+            self.writes.append((f'.{func.attr}()', node.lineno))
+        self.generic_visit(node)
+
+
+def output_dir_for(module_path, literal):
+    """Resolve an output-like literal against its module's directory, cutting it after the output directory"""
+    parts = path_parts(literal)
+    for depth, part in enumerate(parts):
+        if part.lower() in OUTPUT_DIR_NAMES:
+            parts = parts[:depth + 1]
+            break
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(module_path), *parts))
+    if resolved == '..' or resolved.startswith('../'):
+        return None
+    return resolved
+
+
+def analyze_archive(zip_path, manifest):
+    """
+    Statically answer the analysis prompt's questions from the archive's sources.
+
+    Returns {'conclusion', 'confidence', 'reasoning', 'evidence'}, where conclusion has
+    the same python / output_handled_by_python / path_output schema as the LLM's and
+    confidence (0-1) says how safely the LLM call can be skipped.
+    """
+    files = [m for m in manifest['members'] if not m['is_dir'] and not m['vendored']]
+    member_dirs = {posixpath.dirname(m['name']) for m in files} | {m['name'].rstrip('/') for m in manifest['members'] if m['is_dir']}
+    python_files = [m for m in files if m['name'].endswith('.py')]
+    foreign_files = [m for m in files if m['name'].lower().endswith(FOREIGN_SOURCE_EXTENSIONS)]
+
+    genai_modules, route_modules, writer_modules, syntax_errors = {}, {}, {}, []
+    output_dirs = {}
+    foreign_genai, foreign_writers = [], []
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        for member in python_files:
+            if member['size'] > MAX_SOURCE_BYTES:
+                continue
+            try:
+                tree = ast.parse(zf.read(member['name']), filename=member['name'])
+            except (SyntaxError, ValueError):
+                syntax_errors.append(member['name'])
+                continue
+            facts = ModuleFacts()
+            facts.visit(tree)
+            used_genai = {module for module in GENAI_MODULES
+                          for name in facts.imports if name == module or name.startswith(module + '.')}
+            if used_genai:
+                genai_modules[member['name']] = sorted(used_genai)
+            if facts.routes:
+                route_modules[member['name']] = facts.routes
+            if facts.writes:
+                writer_modules[member['name']] = facts.writes
+                for literal in facts.output_literals:
+                    directory = output_dir_for(member['name'], literal)
+                    if directory:
+                        output_dirs.setdefault(directory, set()).add(member['name'])
+        for member in foreign_files:
+            if member['size'] > MAX_SOURCE_BYTES:
+                continue
+            text = zf.read(member['name']).decode('utf-8', errors='replace')
+            if FOREIGN_GENAI_PATTERN.search(text):
+                foreign_genai.append(member['name'])
+            if FOREIGN_WRITE_PATTERN.search(text) and FOREIGN_OUTPUT_PATTERN.search(text):
+                foreign_writers.append(member['name'])
+
+    confirmed_dirs = sorted(d for d in output_dirs if d in member_dirs)
+    candidates = confirmed_dirs or sorted(output_dirs)
+    path_output = min(candidates, key=lambda d: (d.count('/'), d)) if candidates else None
+
+    chat_routes = {name: routes for name, routes in route_modules.items() if any(CHAT_ROUTE_PATTERN.search(r) for r in routes)}
+    # GenAI logic or conversation handling in Python; an SDK import is the stronger signal
+    python = bool(genai_modules or chat_routes)
+    output_handled_by_python = python and path_output is not None
+    reasons = []
+    if not python_files:
+        reasons.append("The archive contains no Python sources outside vendored directories.")
+        confidence = 0.95
+    else:
+        reasons.append(f"{len(python_files)} Python file(s) outside vendored directories.")
+        for name, modules in sorted(genai_modules.items()):
+            reasons.append(f"{name} imports GenAI SDK module(s): {', '.join(modules)}.")
+        for name, routes in sorted(route_modules.items()):
+            reasons.append(f"{name} serves route(s): {', '.join(routes)}.")
+        for directory, writers in sorted(output_dirs.items()):
+            state = 'present in the archive' if directory in confirmed_dirs else 'not present in the archive'
+            reasons.append(f"{', '.join(sorted(writers))} write(s) to {directory}/ ({state}).")
+        if not genai_modules:
+            reasons.append("No Python module imports a GenAI SDK." +
+                           (" Conversation handling is inferred from chat routes." if chat_routes else ""))
+        # Clear single-language positives and Python-free archives are safe; anything mixed goes to the LLM
+        if python and output_handled_by_python:
+            confidence = 0.5
+            confidence += 0.15 if genai_modules else 0
+            confidence += 0.1 if chat_routes else 0
+            confidence += 0.1 if path_output in confirmed_dirs else 0
+            confidence += 0.1 if len(candidates) == 1 else 0
+            if len(candidates) > 1:
+                # Which of several output directories holds the sessions is the LLM's call
+                reasons.append(f"{len(candidates)} candidate output directories; {path_output}/ is only a guess.")
+                confidence = min(confidence, 0.6)
+        else:
+            confidence = 0.4
+        if syntax_errors:
+            reasons.append(f"{len(syntax_errors)} Python file(s) could not be parsed.")
+            confidence -= 0.2
+    if foreign_genai:
+        reasons.append(f"Non-Python sources reference GenAI APIs: {', '.join(sorted(foreign_genai)[:5])}.")
+        if python_files:
+            confidence = min(confidence, 0.3)
+    if foreign_writers and python_files:
+        reasons.append(f"Non-Python sources write session files: {', '.join(sorted(foreign_writers)[:5])}.")
+        confidence = min(confidence, 0.5)
+    foreign_backends = sorted({posixpath.splitext(m['name'])[1] for m in foreign_files
+                               if m['name'].lower().endswith(FOREIGN_BACKEND_EXTENSIONS)})
+    if foreign_backends and python_files:
+        reasons.append(f"The project also has {', '.join(foreign_backends)} services.")
+        confidence = min(confidence, 0.6)
+
+    return {
+        'conclusion': {
+            'python': python,
+            'output_handled_by_python': output_handled_by_python,
+            'path_output': path_output
+        },
+        'confidence': round(max(confidence, 0.0), 2),
+        'reasoning': ' '.join(reasons),
+        'evidence': {
+            'python_files': len(python_files),
+            'genai_modules': genai_modules,
+            'routes': route_modules,
+            'writes': {name: [f'{call} at line {line}' for call, line in writes] for name, writes in writer_modules.items()},
+            'output_dirs': {d: sorted(w) for d, w in output_dirs.items()},
+            'foreign_genai_files': sorted(foreign_genai),
+            'foreign_writer_files': sorted(foreign_writers),
+            'syntax_errors': syntax_errors
+        }
+    }
@@ -0,0 +1,79 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from loguru import logger
+
+
+def prompt_key(template_version, *prompt_inputs):
+    """Combine the prompt-template version with the per-submission prompt inputs into one key"""
+    digest = hashlib.sha256(template_version.encode('utf-8'))
+    for value in prompt_inputs:
+        digest.update(b'\0' + (value or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SubmissionIndex:
+    """
+    Local SQLite index from (archive SHA-256, prompt key) to the outcome of an earlier run:
+    the Azure file_id, the analysis, the conclusion and the generated script.
+
+    An exact resubmission can then be answered without re-uploading the archive or
+    repeating either LLM call.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    content_hash TEXT NOT NULL,
+                    prompt_key TEXT NOT NULL,
+                    submission_id TEXT NOT NULL,
+                    azure_file_id TEXT,
+                    metadata TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (content_hash, prompt_key)
+                )
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, content_hash, key):
+        """Return the stored metadata of an identical earlier submission, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT metadata FROM submissions WHERE content_hash = ? AND prompt_key = ?", (content_hash, key)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE submissions SET hits = hits + 1 WHERE content_hash = ? AND prompt_key = ?", (content_hash, key)
+            )
+        return json.loads(row['metadata'])
+
+    def store(self, content_hash, key, metadata):
+        """Record a processed submission so identical resubmissions are served from the index"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO submissions (content_hash, prompt_key, submission_id, azure_file_id, metadata, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, key, metadata['submission_id'], metadata.get('azure_file_id'),
+                 json.dumps(metadata), datetime.utcnow().isoformat())
+            )
+        logger.info(f"Indexed submission {metadata['submission_id']} under content hash {content_hash[:12]}")